@@ -3,15 +3,16 @@ Navigation API endpoints for word-to-document navigation
 Enables hierarchical traversal from words to context to chunks to documents
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import Optional, List
 from pydantic import BaseModel
 
 from app.services.context_navigator import ContextNavigator
-from app.database import engine
+from app.database import engine, get_redis_client
+from app.core.config import settings
 
 router = APIRouter()
-navigator = ContextNavigator(engine)
+navigator = ContextNavigator(engine, get_redis_client(), settings.NAVIGATION_CACHE_TTL)
 
 # Response models
 class WordOccurrence(BaseModel):
@@ -109,10 +110,11 @@ async def get_chunk_data(
     Example: GET /chunk/uuid-123?highlight=custody&highlight=support
     """
     try:
-        chunk_data = navigator.get_chunk_with_highlights(chunk_id, highlight)
-        if not chunk_data:
+        # Payload is built as JSON by PostgreSQL; pass it through untouched
+        payload = navigator.get_chunk_with_highlights_json(chunk_id, highlight)
+        if not payload:
             raise HTTPException(status_code=404, detail="Chunk not found")
-        return chunk_data
+        return Response(content=payload, media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
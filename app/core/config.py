@@ -39,6 +39,13 @@ class Settings(BaseSettings):
     DATABASE_USER: str = "legal_user"
     DATABASE_PASSWORD: str = "legal_pass"
     
+    # Redis cache (optional; navigation results are cached when set)
+    REDIS_URL: Optional[str] = None
+    NAVIGATION_CACHE_TTL: int = 3600
+    
+    # Sentence splitter for ingestion: "regex" or "nupunkt" (optional package)
+    SENTENCE_SPLITTER: str = "regex"
+    
     # AI/LLM Configuration
     OPENAI_API_KEY: Optional[str] = None
     OPENAI_MODEL: str = "gpt-4o-mini"
@@ -1,16 +1,33 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 import os
-from typing import Generator
+from typing import Generator, Optional
 from app.core.config import Settings
 
 # Database configuration with smart environment detection
 settings = Settings()
 DATABASE_URL = os.getenv("DATABASE_URL") or settings.default_database_url
 
-engine = create_engine(DATABASE_URL, echo=True)
+# insertmanyvalues batches executemany INSERT ... RETURNING into multi-row statements;
+# query_cache_size holds the compiled forms of the services' class-level statements
+engine = create_engine(DATABASE_URL, echo=True, insertmanyvalues_page_size=1000, query_cache_size=1200)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+REDIS_URL = os.getenv("REDIS_URL") or settings.REDIS_URL
+_redis_client = None
+
+
+def get_redis_client() -> Optional["redis.Redis"]:
+    """Shared Redis client, or None when REDIS_URL is unset or redis is not installed"""
+    global _redis_client
+    if _redis_client is None and REDIS_URL:
+        try:
+            import redis
+        except ImportError:
+            return None
+        _redis_client = redis.Redis.from_url(REDIS_URL)
+    return _redis_client
+
 
 def create_tables():
     """Tables are created by init-db.sql during container startup"""
@@ -8,7 +8,7 @@ import logging
 import os
 import time
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Set, Tuple, Any
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
@@ -207,19 +207,17 @@ class LegalCaseIngestor:
                 chunk_ids = self._insert_chunks(case_id, enhanced_chunks, full_text, document_id)
                 logger.info(f"[OK] Inserted {len(chunk_ids)} chunks")
                 
-                # Step 7: Process chunks into sentences
-                logger.info("[PROCESS] Processing chunks into sentences...")
+                # Steps 7-8: Process chunks into sentences and words (one transaction per case)
+                logger.info("[PROCESS] Processing chunks into sentences and words...")
                 sentence_stats = self._process_case_sentences(case_id, enhanced_chunks, chunk_ids, document_id)
                 logger.info(f"[OK] Processed {sentence_stats['total_sentences']} sentences with {sentence_stats['total_words']} words")
                 
-                # Step 8: Process words for precise search (sentence-level)
-                logger.info("[WORD] Processing words at sentence level...")
-                word_stats = self.word_processor.process_case_sentences_words(case_id, document_id)
+                word_stats = sentence_stats['word_stats']
                 logger.info(f"[OK] Processed {word_stats['total_words']} words, {word_stats['unique_words']} unique from {word_stats['sentences_processed']} sentences")
                 
                 # Step 9: Extract phrases for terminology search
                 logger.info("[PHRASE] Extracting phrases...")
-                phrase_stats = self._extract_case_phrases(case_id, enhanced_chunks, document_id)
+                phrase_stats = self._extract_case_phrases(case_id, enhanced_chunks, chunk_ids, document_id)
                 logger.info(f"[OK] Extracted {phrase_stats['phrases_inserted']} legal phrases")
                 
                 # Step 10: Generate embeddings for global search
@@ -238,9 +236,6 @@ class LegalCaseIngestor:
                 self._update_case_embedding(case_id, case_embedding, full_text, source_file_info)
                 logger.info("[OK] Created global embeddings and case-level embedding")
                 
-                # Step 9: Update word document frequencies
-                self.word_processor.update_word_document_frequencies(case_id)
-                
                 # Get final statistics
                 case_stats = self.database_inserter.get_case_stats(case_id)
             else:
@@ -259,6 +254,9 @@ class LegalCaseIngestor:
                 'embedding_dimension': len(case_embedding) if case_embedding else 0
             }
             
+            if case_id:
+                self._invalidate_navigation_cache(case_id)
+            
             logger.info(f"[DONE] Case ingestion completed successfully for case {case_id}")
             return result
             
@@ -266,6 +264,18 @@ class LegalCaseIngestor:
             logger.error(f"[FAIL] Case ingestion failed for case {case_id}: {str(e)}")
             raise
     
+    def _invalidate_navigation_cache(self, case_id: int) -> None:
+        """Drop cached navigator results for a case that was just (re)ingested"""
+        try:
+            from ..database import get_redis_client
+            from .context_navigator import invalidate_navigation_cache
+            
+            removed = invalidate_navigation_cache(get_redis_client(), case_id)
+            if removed:
+                logger.info(f"[CACHE] Invalidated {removed} navigation cache entries for case {case_id}")
+        except Exception as e:
+            logger.warning(f"[WARN] Navigation cache invalidation failed for case {case_id}: {e}")
+    
     def _determine_section(self, text: str) -> str:
         """Determine what section this chunk represents"""
         text_lower = text.lower()
@@ -335,110 +345,99 @@ class LegalCaseIngestor:
         return chunk_ids
     
     def _process_case_sentences(self, case_id: int, enhanced_chunks: List[Dict], 
-                               chunk_ids: List[int], document_id: Optional[int] = None) -> Dict[str, int]:
-        """Process chunks into sentences and create sentence records"""
-        total_sentences = 0
-        total_words = 0
-        global_sentence_counter = 0
+                               chunk_ids: List[int], document_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Process chunks into sentence records and sentence-level words.
+        
+        All sentences of the case are loaded with one COPY and the sentence_count
+        updates share that transaction; the case's vocabulary is resolved with one
+        word-dictionary call, and df is updated in a short transaction afterwards.
+        """
+        words_processed = 0
+        # Word IDs, not strings: ints are smaller and cheaper to hash on long cases
+        unique_word_ids: Set[int] = set()
         
         try:
-            for i, (enhanced_chunk, chunk_id) in enumerate(zip(enhanced_chunks, chunk_ids)):
-                chunk = enhanced_chunk['chunk']
-                
-                # Process chunk into sentences
-                sentence_records = self.sentence_processor.process_chunk_sentences(
+            with self.db.begin() as conn:
+                # Split every chunk and insert all sentences at once
+                records_by_chunk = self.sentence_processor.process_case_sentences_bulk(
                     case_id=case_id,
-                    chunk_id=chunk_id,
-                    chunk_text=chunk.text,
+                    chunks=[(chunk_id, ec['chunk'].text) for ec, chunk_id in zip(enhanced_chunks, chunk_ids)],
                     document_id=document_id,
-                    global_sentence_counter=global_sentence_counter
+                    conn=conn,
+                    use_copy=True  # Initial load: COPY is the fastest bulk path
                 )
                 
-                # Update counters
-                chunk_sentence_count = len(sentence_records)
-                total_sentences += chunk_sentence_count
-                total_words += sum(s['word_count'] for s in sentence_records)
-                global_sentence_counter += chunk_sentence_count
-                
-                # Update chunk sentence count
-                self.sentence_processor.update_chunk_sentence_count(chunk_id, chunk_sentence_count)
+                # Tokenize every new sentence once, then resolve the case's whole
+                # vocabulary in one dictionary round-trip. The dictionary commits
+                # in its own short transaction (see get_or_create_word_ids), so
+                # a rollback here cannot leave cached IDs for missing words.
+                vocabulary: Set[str] = set()
+                for sentence_records in records_by_chunk.values():
+                    for record in sentence_records:
+                        tokens = self.word_processor.tokenize_text(record['text'])
+                        words_processed += len(tokens)
+                        vocabulary.update(tokens)
+                unique_word_ids.update(self.word_processor.get_or_create_word_ids(vocabulary).values())
                 
-                logger.debug(f"Processed chunk {i+1}/{len(chunk_ids)}: {chunk_sentence_count} sentences")
-            
-            return {
-                'total_sentences': total_sentences,
-                'total_words': total_words
-            }
-            
+                # Update chunk sentence counts
+                self.sentence_processor.update_chunk_sentence_counts(
+                    {chunk_id: len(records) for chunk_id, records in records_by_chunk.items()}, conn
+                )
         except Exception as e:
             logger.error(f"Error processing sentences: {e}")
             return {
                 'total_sentences': 0,
-                'total_words': 0
+                'total_words': 0,
+                'word_stats': {'total_words': 0, 'unique_words': 0, 'sentences_processed': 0}
+            }
+        
+        # Each word of the case counts once towards its document frequency.
+        # Own short transaction, after the sentences commit: the df UPDATE
+        # locks word_dictionary rows that every other case shares. The
+        # sentences are already stored, so a failure here (e.g. word_case
+        # missing before migration 021) only leaves df stale for this case.
+        try:
+            with self.db.begin() as conn:
+                self.word_processor.update_document_frequencies(case_id, unique_word_ids, conn)
+        except Exception as e:
+            logger.warning(f"[WARN] Document frequency update failed for case {case_id}: {e}")
+        
+        total_sentences = sum(len(records) for records in records_by_chunk.values())
+        total_words = sum(s['word_count'] for records in records_by_chunk.values() for s in records)
+        
+        return {
+            'total_sentences': total_sentences,
+            'total_words': total_words,
+            'word_stats': {
+                'total_words': words_processed,
+                'unique_words': len(unique_word_ids),
+                'sentences_processed': total_sentences
             }
+        }
     
     def _process_case_words(self, case_id: int, enhanced_chunks: List[Dict]) -> Dict[str, int]:
-        """Process all words in case chunks"""
-        total_words = 0
-        unique_words = set()
+        """Process all words in case chunks
         
-        for enhanced_chunk in enhanced_chunks:
-            chunk = enhanced_chunk['chunk']
-            
-            # Get chunk_id - we need to query for it since we just inserted
-            with self.db.connect() as conn:
-                query = text("""
-                    SELECT chunk_id FROM case_chunks 
-                    WHERE case_id = :case_id AND chunk_order = :chunk_order
-                """)
-                result = conn.execute(query, {
-                    'case_id': case_id,
-                    'chunk_order': chunk.order
-                })
-                row = result.fetchone()
-                chunk_id = str(row.chunk_id)
-            
-            # Process words for this chunk
-            word_stats = self.word_processor.process_chunk_words(
-                case_id, chunk_id, chunk.text
-            )
-            
-            total_words += word_stats['words_processed']
-            
-            # Get unique words from this chunk
-            tokens = self.word_processor.tokenize_text(chunk.text)
-            unique_words.update(tokens)
+        Works from the case's stored sentences: each sentence is tokenized once and
+        its unique words are accumulated in the same pass.
+        """
+        word_stats = self.word_processor.process_case_sentences_words(case_id)
         
         return {
-            'total_words': total_words,
-            'unique_words': len(unique_words)
+            'total_words': word_stats['total_words'],
+            'unique_words': word_stats['unique_words']
         }
     
-    def _extract_case_phrases(self, case_id: int, enhanced_chunks: List[Dict], document_id: Optional[int] = None) -> Dict[str, int]:
+    def _extract_case_phrases(self, case_id: int, enhanced_chunks: List[Dict], chunk_ids: List[int],
+                              document_id: Optional[int] = None) -> Dict[str, int]:
         """Extract phrases from all case chunks"""
-        # Prepare chunk data for phrase extraction
-        chunk_data = []
-        
-        for enhanced_chunk in enhanced_chunks:
-            chunk = enhanced_chunk['chunk']
-            
-            # Get chunk_id from database
-            with self.db.connect() as conn:
-                query = text("""
-                    SELECT chunk_id FROM case_chunks 
-                    WHERE case_id = :case_id AND chunk_order = :chunk_order
-                """)
-                result = conn.execute(query, {
-                    'case_id': case_id,
-                    'chunk_order': chunk.order
-                })
-                row = result.fetchone()
-                chunk_id = str(row.chunk_id)
-            
-            chunk_data.append({
-                'chunk_id': chunk_id,
-                'text': chunk.text
-            })
+        # chunk_ids come back from _insert_chunks in chunk order, so no per-chunk
+        # connection checkout or lookup query is needed
+        chunk_data = [
+            {'chunk_id': chunk_id, 'text': enhanced_chunk['chunk'].text}
+            for enhanced_chunk, chunk_id in zip(enhanced_chunks, chunk_ids)
+        ]
         
         # Extract phrases
         return self.phrase_extractor.process_case_phrases(case_id, chunk_data, document_id)
@@ -1,67 +1,264 @@
 """
 Context Navigator: Word-to-Document Navigation Service
 Enables hierarchical navigation from word → context → chunk → document
+
+Per-chunk sentence lookups rely on the case_sentences indexes added in
+migrations/019_case_sentences_navigation_indexes.sql.
 """
 
+from __future__ import annotations
+
+import hashlib
 import logging
-from typing import List, Dict, Optional, Tuple
+import re
+from datetime import date, datetime
+from typing import Any, Callable, Iterator, Optional
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
+try:
+    from redis.exceptions import RedisError
+except ImportError:
+    # redis is optional; without it no client is ever configured
+    RedisError = OSError
+
+try:
+    import orjson as _json
+
+    def _dumps(value: Any) -> bytes:
+        return _json.dumps(value, default=str)
+except ImportError:
+    import json as _json
+
+    def _dumps(value: Any) -> str:
+        return _json.dumps(value, default=str)
+
 logger = logging.getLogger(__name__)
 
+# Redis cache for read-only navigator results (chunks/cases are append-only)
+NAV_CACHE_TTL = 3600
+# Per-case set of cached keys, used by invalidate_navigation_cache. It expires
+# with the newest entry added to it, so it never outlives the keys it names
+_CASE_KEYS = "nav:case:{case_id}"
+
+
+def invalidate_navigation_cache(redis_client, case_id) -> int:
+    """
+    Drop every cached navigator entry recorded for a case.
+    
+    Called by the ingestion pipeline after a case is (re)written.
+    
+    Returns:
+        Number of cache keys deleted
+    """
+    if redis_client is None:
+        return 0
+    index_key = _CASE_KEYS.format(case_id=case_id)
+    keys = list(redis_client.smembers(index_key))
+    if not keys:
+        return 0
+    return redis_client.delete(*keys, index_key) - 1
+
+
+def clear_navigation_cache(redis_client) -> int:
+    """
+    Drop every cached navigator entry, for when case data is wiped wholesale.
+    
+    Returns:
+        Number of cache keys deleted
+    """
+    if redis_client is None:
+        return 0
+    removed = 0
+    batch = []
+    for key in redis_client.scan_iter(match="nav:*", count=1000):
+        batch.append(key)
+        if len(batch) >= 1000:
+            removed += redis_client.delete(*batch)
+            batch.clear()
+    if batch:
+        removed += redis_client.delete(*batch)
+    return removed
+
+
+# Date/timestamp fields of get_document_from_chunk results; JSON stores them as
+# ISO strings, so cache hits convert them back to date/datetime objects
+_DOCUMENT_DATE_FIELDS = ('filing_date', 'created_at', 'updated_at')
+
+
+def _parse_iso(value: Any) -> Any:
+    """Turn an ISO date ('YYYY-MM-DD') or timestamp string back into date/datetime."""
+    if not isinstance(value, str):
+        return value
+    if len(value) == 10:
+        return date.fromisoformat(value)
+    return datetime.fromisoformat(value)
+
+
+def _restore_document_dates(document: dict) -> dict:
+    """Give a cached document the same date/datetime types as a freshly loaded one."""
+    for field in _DOCUMENT_DATE_FIELDS:
+        if field in document:
+            document[field] = _parse_iso(document[field])
+    return document
+
+_SINGLE_TOKEN_RE = re.compile(r'^\w+$')
+
+
+def _tsquery_sql(word: str) -> str:
+    """
+    Pick the tsquery constructor for a search term.
+    
+    Single alphanumeric tokens use plainto_tsquery (cheapest to parse); anything
+    else goes through websearch_to_tsquery so quoted phrases ("best interest"),
+    OR and -negation are honoured against the same tsv index.
+    """
+    if _SINGLE_TOKEN_RE.match(word):
+        return "plainto_tsquery('english'::regconfig, :word)"
+    return "websearch_to_tsquery('english'::regconfig, :word)"
+
+
+def _adjacent_chunk_dict(row) -> dict:
+    """Build an adjacent-chunk dict, classifying position against row.target_order."""
+    distance = abs(row.chunk_order - row.target_order)
+    if distance == 0:
+        position_type = 'TARGET'
+    elif row.chunk_order < row.target_order:
+        position_type = 'BEFORE'
+    else:
+        position_type = 'AFTER'
+    
+    return {
+        'chunk_id': str(row.chunk_id),
+        'chunk_order': row.chunk_order,
+        'section': row.section,
+        'text': row.text,
+        'preview': row.preview,
+        'position_type': position_type,
+        'distance_from_target': distance
+    }
+
 class ContextNavigator:
     """Navigate from words to documents through the data hierarchy"""
     
-    def __init__(self, db_engine: Engine):
+    def __init__(self, db_engine: Engine, redis_client=None, cache_ttl: int = NAV_CACHE_TTL):
         self.db = db_engine
+        self.redis = redis_client
+        self.cache_ttl = cache_ttl
     
-    def find_word_in_context(self, word: str, case_id: Optional[str] = None, limit: int = 20) -> List[Dict]:
+    def _cached(self, key: str, fn: Callable[[], Any],
+                decode: Optional[Callable[[Any], Any]] = None) -> Any:
+        """
+        Cache-aside lookup: return the Redis value for key, or compute it with fn
+        and store it for cache_ttl seconds. None results are not cached. Results
+        carrying a case_id are indexed so invalidate_navigation_cache can drop them.
+        decode, if given, is applied to cache hits to restore the types JSON loses.
+        """
+        if self.redis is None:
+            return fn()
+        
+        cached = self._cache_get(key)
+        if cached is not None:
+            value = _json.loads(cached)
+            return decode(value) if decode else value
+        
+        result = fn()
+        if result is not None:
+            case_id = result.get('case_id') if isinstance(result, dict) else None
+            self._cache_put(key, _dumps(result), case_id)
+        return result
+    
+    def _cache_get(self, key: str) -> Optional[Any]:
+        """Read a cached value; Redis failures count as a miss so requests still work."""
+        try:
+            return self.redis.get(key)
+        except RedisError as e:
+            logger.warning(f"Navigation cache read failed for {key}: {e}")
+            return None
+    
+    def _cache_put(self, key: str, value: Any, case_id: Any = None) -> None:
+        """Store value for cache_ttl seconds and index it under its case; failures are logged and ignored."""
+        try:
+            pipe = self.redis.pipeline()
+            pipe.setex(key, self.cache_ttl, value)
+            if case_id is not None:
+                index_key = _CASE_KEYS.format(case_id=case_id)
+                pipe.sadd(index_key, key)
+                pipe.expire(index_key, self.cache_ttl)
+            pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Navigation cache write failed for {key}: {e}")
+    
+    def find_word_in_context(self, word: str, case_id: Optional[str] = None, limit: int = 20) -> list[dict]:
         """
         Find all occurrences of a word with immediate context using tsvector search.
         
         NOTE: Refactored to use tsvector after word_occurrence table was dropped (migration 018).
         
         Args:
-            word: Word to search for
+            word: Word to search for. Also accepts web-search syntax:
+                  "quoted phrase", OR, and -excluded terms
             case_id: Optional case filter
             limit: Maximum results
             
         Returns:
             List of sentences containing the word with context info
         """
-        with self.db.connect() as conn:
-            base_query = """
-                SELECT 
-                    cs.case_id,
-                    cs.chunk_id, 
-                    cs.sentence_id,
-                    cs.sentence_text,
-                    cc.section,
-                    cc.chunk_order,
-                    c.title as case_title,
-                    c.court,
-                    c.filing_date,
-                    substring(cc.text from 1 for 200) as chunk_preview
-                FROM case_sentences cs
-                JOIN case_chunks cc ON cs.chunk_id = cc.chunk_id
-                JOIN cases c ON cs.case_id = c.case_id
-                WHERE cs.tsv @@ plainto_tsquery('english', :word)
-            """
-            
-            params = {'word': word.lower()}
-            
-            if case_id:
-                base_query += " AND cs.case_id = :case_id"
-                params['case_id'] = case_id
-            
-            base_query += " ORDER BY cs.case_id, cc.chunk_order, cs.sentence_order LIMIT :limit"
-            params['limit'] = limit
+        return list(self.iter_word_in_context(word, case_id, limit))
+    
+    def iter_word_in_context(self, word: str, case_id: Optional[str] = None, limit: int = 20,
+                             yield_per: int = 100) -> Iterator[dict]:
+        """
+        Streaming variant of find_word_in_context.
+        
+        Uses a server-side cursor (stream_results) so rows are fetched from
+        PostgreSQL in batches of ``yield_per`` instead of buffering the whole
+        result set in the driver. Use this for large limits or when each row
+        is only consumed once.
+        
+        Args:
+            word: Word to search for (web-search syntax supported, see find_word_in_context)
+            case_id: Optional case filter
+            limit: Maximum results
+            yield_per: Rows fetched per round-trip
             
-            result = conn.execute(text(base_query), params)
+        Yields:
+            Sentence dictionaries with context info
+        """
+        base_query = f"""
+            SELECT 
+                cs.case_id,
+                cs.chunk_id, 
+                cs.sentence_id,
+                cs.text AS sentence_text,
+                cc.section,
+                cc.chunk_order,
+                c.title as case_title,
+                c.court,
+                c.filing_date,
+                substring(cc.text from 1 for 200) as chunk_preview
+            FROM case_sentences cs
+            JOIN case_chunks cc ON cs.chunk_id = cc.chunk_id
+            JOIN cases c ON cs.case_id = c.case_id
+            WHERE cs.tsv @@ {_tsquery_sql(word)}
+        """
+        
+        params = {'word': word.lower()}
+        
+        if case_id:
+            base_query += " AND cs.case_id = :case_id"
+            params['case_id'] = case_id
+        
+        base_query += " ORDER BY cs.case_id, cc.chunk_order, cs.sentence_order LIMIT :limit"
+        params['limit'] = limit
+        
+        with self.db.connect() as conn:
+            result = conn.execution_options(
+                stream_results=True, yield_per=yield_per
+            ).execute(text(base_query), params)
             
-            return [
-                {
+            for row in result:
+                yield {
                     'case_id': row.case_id,
                     'chunk_id': str(row.chunk_id),
                     'sentence_id': row.sentence_id,
@@ -74,10 +271,8 @@ class ContextNavigator:
                     'chunk_preview': row.chunk_preview,
                     'sentence_text': row.sentence_text
                 }
-                for row in result
-            ]
     
-    def get_word_context_window(self, word: str, chunk_id: int, window_size: int = 10) -> Dict:
+    def get_word_context_window(self, word: str, chunk_id: int, window_size: int = 10) -> dict:
         """
         Get surrounding sentences around a target word in a chunk using tsvector search.
         
@@ -85,7 +280,7 @@ class ContextNavigator:
         Now returns sentences containing the word rather than individual word positions.
         
         Args:
-            word: Target word
+            word: Target word, or web-search query ("quoted phrase", OR, -term)
             chunk_id: Chunk containing the word
             window_size: Not used (kept for API compatibility)
             
@@ -93,16 +288,16 @@ class ContextNavigator:
             Dictionary with context sentences and metadata
         """
         with self.db.connect() as conn:
-            query = text("""
+            query = text(f"""
                 SELECT 
                     cs.sentence_id,
-                    cs.sentence_text,
+                    cs.text AS sentence_text,
                     cs.sentence_order,
                     cc.text as chunk_text
                 FROM case_sentences cs
                 JOIN case_chunks cc ON cs.chunk_id = cc.chunk_id
                 WHERE cs.chunk_id = :chunk_id
-                  AND cs.tsv @@ plainto_tsquery('english', :word)
+                  AND cs.tsv @@ {_tsquery_sql(word)}
                 ORDER BY cs.sentence_order
             """)
             
@@ -127,81 +322,98 @@ class ContextNavigator:
                 'window_size': window_size
             }
     
-    def get_chunk_with_highlights(self, chunk_id: int, highlight_words: List[str] = None) -> Dict:
+    def get_chunk_with_highlights(self, chunk_id: int, highlight_words: list[str] = None) -> dict:
         """
         Get full chunk text with optional word highlighting using tsvector search.
         
         NOTE: Refactored to use tsvector after word_occurrence table was dropped (migration 018).
+        The whole payload is built by PostgreSQL (json_build_object) in one query.
         
         Args:
             chunk_id: Target chunk ID
-            highlight_words: Words to highlight in the text
+            highlight_words: Words to highlight in the text; each entry may be a
+                             web-search query such as a "quoted phrase"
             
         Returns:
             Chunk data with highlighting info
         """
+        payload = self.get_chunk_with_highlights_json(chunk_id, highlight_words)
+        return _json.loads(payload) if payload else None
+    
+    def get_chunk_with_highlights_json(self, chunk_id: int, highlight_words: list[str] = None) -> Optional[str]:
+        """
+        Same as get_chunk_with_highlights but returns the PostgreSQL-built JSON
+        document as a string, ready to be sent as a response body without
+        re-serialization in Python.
+        """
+        words = list(dict.fromkeys(highlight_words)) if highlight_words else []
+        
+        if self.redis is None:
+            return self._load_chunk_payload(chunk_id, words)
+        
+        # Cache the JSON text as-is; no decode/encode round-trip on hits
+        words_hash = hashlib.sha1('\x1f'.join(sorted(words)).encode('utf-8')).hexdigest()[:16]
+        key = f"nav:hlchunk:{chunk_id}:{words_hash}"
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached.decode('utf-8') if isinstance(cached, bytes) else cached
+        
+        payload = self._load_chunk_payload(chunk_id, words)
+        if payload is not None:
+            self._cache_put(key, payload, _json.loads(payload).get('case_id'))
+        return payload
+    
+    def _load_chunk_payload(self, chunk_id: int, words: list[str]) -> Optional[str]:
+        """Run the single json_build_object query behind get_chunk_with_highlights(_json)."""
+        # Only words with at least one matching sentence get a key; single tokens use
+        # plainto_tsquery, anything else websearch_to_tsquery (see _tsquery_sql)
+        highlights_sql = """,
+                    'highlighted_sentences', (
+                        SELECT COALESCE(
+                            json_object_agg(w.word, s.sents) FILTER (WHERE s.sents IS NOT NULL),
+                            '{}'::json)
+                        FROM unnest(CAST(:words AS text[])) AS w(word)
+                        LEFT JOIN LATERAL (
+                            SELECT json_agg(json_build_object(
+                                       'sentence_id', cs.sentence_id,
+                                       'sentence_order', cs.sentence_order,
+                                       'text', cs.text) ORDER BY cs.sentence_order) AS sents
+                            FROM case_sentences cs
+                            WHERE cs.chunk_id = cc.chunk_id
+                              AND cs.tsv @@ CASE
+                                  WHEN w.word ~ '^\\w+$'
+                                      THEN plainto_tsquery('english'::regconfig, lower(w.word))
+                                  ELSE websearch_to_tsquery('english'::regconfig, lower(w.word))
+                              END
+                        ) s ON true
+                    )""" if words else ""
+        
+        query = text(f"""
+            SELECT json_build_object(
+                    'chunk_id', cc.chunk_id::text,
+                    'case_id', cc.case_id,
+                    'chunk_order', cc.chunk_order,
+                    'section', cc.section,
+                    'text', cc.text,
+                    'case_title', c.title,
+                    'court', c.court,
+                    'filing_date', c.filing_date,
+                    'total_sentences', (SELECT COUNT(*) FROM case_sentences cs WHERE cs.chunk_id = cc.chunk_id){highlights_sql}
+                )::text AS payload
+            FROM case_chunks cc
+            JOIN cases c ON cc.case_id = c.case_id
+            WHERE cc.chunk_id = :chunk_id
+        """)
+        
+        params = {'chunk_id': chunk_id}
+        if words:
+            params['words'] = words
+        
         with self.db.connect() as conn:
-            # Get chunk data with sentence count instead of word count
-            chunk_query = text("""
-                SELECT 
-                    cc.chunk_id,
-                    cc.case_id,
-                    cc.chunk_order,
-                    cc.section,
-                    cc.text,
-                    c.title as case_title,
-                    c.court,
-                    c.filing_date,
-                    (SELECT COUNT(*) FROM case_sentences cs WHERE cs.chunk_id = cc.chunk_id) as total_sentences
-                FROM case_chunks cc
-                JOIN cases c ON cc.case_id = c.case_id
-                WHERE cc.chunk_id = :chunk_id
-            """)
-            
-            chunk_result = conn.execute(chunk_query, {'chunk_id': chunk_id})
-            chunk_row = chunk_result.fetchone()
-            
-            if not chunk_row:
-                return None
-            
-            chunk_data = {
-                'chunk_id': str(chunk_row.chunk_id),
-                'case_id': chunk_row.case_id,
-                'chunk_order': chunk_row.chunk_order,
-                'section': chunk_row.section,
-                'text': chunk_row.text,
-                'case_title': chunk_row.case_title,
-                'court': chunk_row.court,
-                'filing_date': chunk_row.filing_date,
-                'total_sentences': chunk_row.total_sentences
-            }
-            
-            # Find sentences containing highlight words using tsvector
-            if highlight_words:
-                highlighted_sentences = {}
-                for word in highlight_words:
-                    sent_query = text("""
-                        SELECT cs.sentence_id, cs.sentence_order, cs.sentence_text
-                        FROM case_sentences cs
-                        WHERE cs.chunk_id = :chunk_id
-                          AND cs.tsv @@ plainto_tsquery('english', :word)
-                        ORDER BY cs.sentence_order
-                    """)
-                    
-                    sent_result = conn.execute(sent_query, {
-                        'word': word.lower(),
-                        'chunk_id': chunk_id
-                    })
-                    
-                    sentences = [{'sentence_id': row.sentence_id, 'sentence_order': row.sentence_order, 'text': row.sentence_text} for row in sent_result]
-                    if sentences:
-                        highlighted_sentences[word] = sentences
-                
-                chunk_data['highlighted_sentences'] = highlighted_sentences
-            
-            return chunk_data
+            row = conn.execute(query, params).fetchone()
+            return row.payload if row else None
     
-    def get_adjacent_chunks(self, chunk_id: int, range_before: int = 10, range_after: int = 10) -> List[Dict]:
+    def get_adjacent_chunks(self, chunk_id: int, range_before: int = 10, range_after: int = 10) -> list[dict]:
         """
         Get chunks surrounding the target chunk
         
@@ -213,6 +425,15 @@ class ContextNavigator:
         Returns:
             List of adjacent chunks with position info
         """
+        # Cached together with the case_id so invalidate_navigation_cache reaches it
+        adjacent = self._cached(
+            f"nav:adj:{chunk_id}:{range_before}:{range_after}",
+            lambda: self._load_adjacent_chunks(chunk_id, range_before, range_after)
+        )
+        return adjacent['chunks'] if adjacent else []
+    
+    def _load_adjacent_chunks(self, chunk_id: int, range_before: int, range_after: int) -> Optional[dict]:
+        """Query behind get_adjacent_chunks -> {'case_id', 'chunks'}, or None if the chunk is unknown."""
         with self.db.connect() as conn:
             query = text("""
                 WITH target_chunk AS (
@@ -221,17 +442,13 @@ class ContextNavigator:
                     WHERE chunk_id = :chunk_id
                 )
                 SELECT 
+                    tc.case_id,
                     cc.chunk_id,
                     cc.chunk_order,
                     cc.section,
                     cc.text,
                     substring(cc.text from 1 for 300) as preview,
-                    CASE 
-                        WHEN cc.chunk_order < tc.chunk_order THEN 'BEFORE'
-                        WHEN cc.chunk_order = tc.chunk_order THEN 'TARGET'
-                        ELSE 'AFTER'
-                    END as position_type,
-                    ABS(cc.chunk_order - tc.chunk_order) as distance_from_target
+                    tc.chunk_order as target_order
                 FROM case_chunks cc
                 CROSS JOIN target_chunk tc
                 WHERE cc.case_id = tc.case_id
@@ -246,20 +463,71 @@ class ContextNavigator:
                 'range_after': range_after
             })
             
-            return [
-                {
-                    'chunk_id': str(row.chunk_id),
-                    'chunk_order': row.chunk_order,
-                    'section': row.section,
-                    'text': row.text,
-                    'preview': row.preview,
-                    'position_type': row.position_type,
-                    'distance_from_target': row.distance_from_target
-                }
-                for row in result
-            ]
+            rows = result.fetchall()
+            if not rows:
+                return None
+            
+            # position_type / distance_from_target are derived in Python from target_order
+            return {
+                'case_id': rows[0].case_id,
+                'chunks': [_adjacent_chunk_dict(row) for row in rows]
+            }
+    
+    def get_adjacent_chunks_batch(self, chunk_ids: list[int], range_before: int = 10,
+                                  range_after: int = 10) -> dict[int, list[dict]]:
+        """
+        Get chunks surrounding several target chunks in a single query.
+        
+        Batched counterpart of get_adjacent_chunks: one round-trip for all
+        targets instead of one CTE query per target.
+        
+        Args:
+            chunk_ids: Target chunk IDs (duplicates are ignored)
+            range_before: Number of chunks before each target
+            range_after: Number of chunks after each target
+            
+        Returns:
+            Mapping of target chunk_id -> list of adjacent chunks with position info
+        """
+        unique_ids = sorted({int(cid) for cid in chunk_ids})
+        if not unique_ids:
+            return {}
+        
+        with self.db.connect() as conn:
+            query = text("""
+                WITH targets AS (
+                    SELECT chunk_id, case_id, chunk_order
+                    FROM case_chunks
+                    WHERE chunk_id = ANY(:chunk_ids)
+                )
+                SELECT 
+                    t.chunk_id as target_id,
+                    cc.chunk_id,
+                    cc.chunk_order,
+                    cc.section,
+                    cc.text,
+                    substring(cc.text from 1 for 300) as preview,
+                    t.chunk_order as target_order
+                FROM targets t
+                JOIN case_chunks cc ON cc.case_id = t.case_id
+                 AND cc.chunk_order BETWEEN (t.chunk_order - :range_before)
+                                        AND (t.chunk_order + :range_after)
+                ORDER BY t.chunk_id, cc.chunk_order
+            """)
+            
+            result = conn.execute(query, {
+                'chunk_ids': unique_ids,
+                'range_before': range_before,
+                'range_after': range_after
+            })
+            
+            adjacent_by_target: dict[int, list[dict]] = {cid: [] for cid in unique_ids}
+            for row in result:
+                adjacent_by_target[row.target_id].append(_adjacent_chunk_dict(row))
+            
+            return adjacent_by_target
     
-    def get_document_from_chunk(self, chunk_id: int) -> Dict:
+    def get_document_from_chunk(self, chunk_id: int) -> dict:
         """
         Get complete document information from a chunk.
         
@@ -271,6 +539,14 @@ class ContextNavigator:
         Returns:
             Complete document data with statistics
         """
+        return self._cached(
+            f"nav:doc:{chunk_id}",
+            lambda: self._load_document_from_chunk(chunk_id),
+            decode=_restore_document_dates
+        )
+    
+    def _load_document_from_chunk(self, chunk_id: int) -> Optional[dict]:
+        """Query behind get_document_from_chunk."""
         with self.db.connect() as conn:
             query = text("""
                 SELECT 
@@ -333,7 +609,7 @@ class ContextNavigator:
                 }
             }
     
-    def navigate_word_to_document(self, word: str, case_id: Optional[str] = None) -> List[Dict]:
+    def navigate_word_to_document(self, word: str, case_id: Optional[str] = None) -> list[dict]:
         """
         Complete navigation from word to full document context
         
@@ -347,6 +623,11 @@ class ContextNavigator:
         # Step 1: Find all word occurrences
         word_occurrences = self.find_word_in_context(word, case_id)
         
+        # Step 4 (batched): Adjacent chunks for every distinct target chunk in one query
+        adjacent_by_chunk = self.get_adjacent_chunks_batch(
+            [occurrence['chunk_id'] for occurrence in word_occurrences]
+        )
+        
         navigation_results = []
         
         for occurrence in word_occurrences:
@@ -358,8 +639,8 @@ class ContextNavigator:
             # Step 3: Get full chunk
             chunk_data = self.get_chunk_with_highlights(chunk_id, [word])
             
-            # Step 4: Get adjacent chunks
-            adjacent_chunks = self.get_adjacent_chunks(chunk_id)
+            # Step 4: Adjacent chunks (prefetched above)
+            adjacent_chunks = adjacent_by_chunk.get(int(chunk_id), [])
             
             # Step 5: Get document
             document = self.get_document_from_chunk(chunk_id)
@@ -0,0 +1,94 @@
+"""
+Bulk loading of case_sentences rows with COPY, shared by the API ingestor
+(app/services/sentence_processor.py) and the pipeline (pipeline/sentence_processor.py)
+"""
+
+import csv
+import io
+import logging
+from datetime import datetime
+from typing import List, Dict, Any, Tuple
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+_SENTENCE_COLUMNS = (
+    'sentence_id', 'case_id', 'chunk_id', 'document_id', 'sentence_order',
+    'global_sentence_order', 'text', 'word_count', 'created_at', 'updated_at'
+)
+
+# SQL compiled once; SQLAlchemy's compiled cache reuses them per call
+_SQL_RESERVE_SENTENCE_IDS = text("""
+    SELECT nextval(pg_get_serial_sequence('case_sentences', 'sentence_id'))
+    FROM generate_series(1, :n)
+""")
+_SQL_INSERT_SENTENCE = text(
+    f"INSERT INTO case_sentences ({', '.join(_SENTENCE_COLUMNS)}) "
+    f"VALUES ({', '.join(':' + name for name in _SENTENCE_COLUMNS)})"
+)
+_COPY_SENTENCES = (
+    f"COPY case_sentences ({', '.join(_SENTENCE_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+)
+
+
+def copy_sentence_rows(conn: Connection, rows: List[Dict[str, Any]]) -> List[Tuple[int, Dict[str, Any]]]:
+    """
+    Load sentence rows with COPY FROM STDIN (CSV) inside the caller's transaction.
+
+    COPY cannot return generated keys, so sentence_ids are reserved from the
+    table's sequence up front and written explicitly. The COPY runs in a
+    savepoint: if any row is rejected, the rows are inserted one by one (each in
+    its own savepoint) and only the bad rows are skipped.
+
+    Args:
+        conn: Open connection; its transaction is not committed here
+        rows: Sentence rows with case_id, chunk_id, document_id, sentence_order,
+              global_sentence_order, text and word_count
+
+    Returns:
+        (sentence_id, row) pairs for the rows stored, in input order
+    """
+    sentence_ids = conn.execute(_SQL_RESERVE_SENTENCE_IDS, {'n': len(rows)}).scalars().all()
+    now = datetime.now()
+
+    try:
+        with conn.begin_nested():
+            _copy_rows(conn, sentence_ids, rows, now)
+        return list(zip(sentence_ids, rows))
+    except Exception as e:
+        logger.warning(f"COPY of {len(rows)} sentences failed, inserting row by row: {e}")
+
+    stored = []
+    for sentence_id, row in zip(sentence_ids, rows):
+        try:
+            with conn.begin_nested():
+                conn.execute(_SQL_INSERT_SENTENCE, {
+                    **row, 'sentence_id': sentence_id, 'created_at': now, 'updated_at': now
+                })
+            stored.append((sentence_id, row))
+        except Exception as e:
+            logger.warning(
+                f"Skipping sentence {row['sentence_order']} of chunk {row['chunk_id']}: {e}"
+            )
+    return stored
+
+
+def _copy_rows(conn: Connection, sentence_ids: List[int], rows: List[Dict[str, Any]],
+               now: datetime) -> None:
+    """Stream the rows to COPY on conn's own DBAPI connection (same transaction)"""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for sentence_id, row in zip(sentence_ids, rows):
+        writer.writerow((
+            sentence_id, row['case_id'], row['chunk_id'], row['document_id'],
+            row['sentence_order'], row['global_sentence_order'], row['text'],
+            row['word_count'], now, now
+        ))
+    buf.seek(0)
+
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(_COPY_SENTENCES, buf)
+    finally:
+        cursor.close()
@@ -4,17 +4,143 @@ Handles splitting chunks into sentences and creating sentence-level embeddings.
 """
 
 import logging
+import os
 import re
-from typing import List, Dict, Any, Optional
-from sqlalchemy import text
-from sqlalchemy.engine import Engine
+import numpy as np
+from typing import List, Dict, Any, Optional, Tuple
+from sqlalchemy import text, table, column, insert, func
+from sqlalchemy.engine import Engine, Connection
+from .sentence_copy import copy_sentence_rows
 # from .embedding_service import generate_embedding  # Not needed - no sentence embeddings
 
 logger = logging.getLogger(__name__)
 
+# Citations and case references that must not be split on their internal periods
+PROTECTED_PATTERNS = [
+    r'\d+\s+P\.\s*\d+d?\s+\d+',  # Pacific Reporter citations
+    r'\d+\s+Wn\.\s*\d*\s+\d+',   # Washington Reports
+    r'\d+\s+U\.S\.\s+\d+',       # U.S. Reports
+    r'RCW\s+\d+\.\d+\.\d+',      # RCW statutes
+    r'WAC\s+\d+\-\d+\-\d+',     # WAC regulations
+]
+
+# Compiled once: one alternation pass to protect citations, one boundary split,
+# one pass to restore placeholders per sentence
+_CITATION_RE = re.compile('|'.join(f'(?:{p})' for p in PROTECTED_PATTERNS), re.IGNORECASE)
+# Periods, question marks, exclamation points followed by space and capital letter
+_BOUNDARY_RE = re.compile(r'(?<=[.!?])\s+(?=[A-Z])')
+_PLACEHOLDER_RE = re.compile(r'__CIT_\d+__')
+# Word counting in C (no intermediate list from str.split())
+_WS_COUNT = re.compile(r'\S+').findall
+
+# Byte-class lookup tables for the vectorized boundary scan (ASCII text only);
+# whitespace matches what \s matches for ASCII in the regex above
+_WS_LUT = np.zeros(256, dtype=bool)
+_WS_LUT[[9, 10, 11, 12, 13, 28, 29, 30, 31, 32]] = True
+_TERM_LUT = np.zeros(256, dtype=bool)
+_TERM_LUT[[ord('.'), ord('!'), ord('?')]] = True
+_UPPER_LUT = np.zeros(256, dtype=bool)
+_UPPER_LUT[ord('A'):ord('Z') + 1] = True
+
+
+def _split_on_boundaries(text: str) -> List[str]:
+    """
+    Equivalent of _BOUNDARY_RE.split(text) using NumPy masks over the bytes.
+    
+    Finds whitespace runs preceded by . ! ? and followed by A-Z in C loops instead
+    of the regex engine's per-position lookbehind/lookahead. Non-ASCII text takes
+    the regex path (byte offsets would not match str offsets).
+    """
+    if not text.isascii():
+        return _BOUNDARY_RE.split(text)
+    
+    arr = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+    edges = np.diff(np.concatenate(([0], _WS_LUT[arr].view(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)   # first whitespace char of each run
+    ends = np.flatnonzero(edges == -1)    # first char after each run
+    
+    inner = (starts > 0) & (ends < len(arr))
+    starts, ends = starts[inner], ends[inner]
+    is_boundary = _TERM_LUT[arr[starts - 1]] & _UPPER_LUT[arr[ends]]
+    
+    pieces = []
+    prev = 0
+    for start, end in zip(starts[is_boundary].tolist(), ends[is_boundary].tolist()):
+        pieces.append(text[prev:start])
+        prev = end
+    pieces.append(text[prev:])
+    return pieces
+
+# Sentence splitter: 'regex' (default, the boundary heuristic above) or 'nupunkt'
+# (optional package: Punkt trained on legal text). Switching changes where
+# sentences break, and so sentence_order and counts for newly ingested cases.
+SENTENCE_SPLITTER = os.getenv("SENTENCE_SPLITTER", "regex").lower()
+
+_load_punkt_model = None
+if SENTENCE_SPLITTER == "nupunkt":
+    try:
+        from nupunkt import load_default_model as _load_punkt_model
+    except ImportError:
+        logger.warning("SENTENCE_SPLITTER=nupunkt but nupunkt is not installed; using the regex splitter")
+
+_punkt_tokenizer = None
+
+
+def _split_raw_sentences(text: str) -> List[str]:
+    """Split text on sentence boundaries with the configured splitter (see SENTENCE_SPLITTER)"""
+    global _punkt_tokenizer
+    if _load_punkt_model is not None:
+        if _punkt_tokenizer is None:
+            _punkt_tokenizer = _load_punkt_model()
+        return _punkt_tokenizer.tokenize(text)
+    return _split_on_boundaries(text)
+
+# Lightweight Core table for batched inserts (insertmanyvalues needs an insert() construct)
+case_sentences_table = table(
+    'case_sentences',
+    column('sentence_id'),
+    column('case_id'),
+    column('chunk_id'),
+    column('document_id'),
+    column('sentence_order'),
+    column('global_sentence_order'),
+    column('text'),
+    column('word_count'),
+    column('created_at'),
+    column('updated_at'),
+)
+
+# Single INSERT ... RETURNING for a whole parameter list; rows come back in parameter order
+_insert_sentences = (
+    insert(case_sentences_table)
+    .values(created_at=func.now(), updated_at=func.now())
+    .returning(case_sentences_table.c.sentence_id, sort_by_parameter_order=True)
+)
+
 class SentenceProcessor:
     """Service for processing text chunks into sentences"""
     
+    # SQL compiled once per class; SQLAlchemy's compiled cache reuses them per call
+    _SQL_UPDATE_CHUNK_SENTENCE_COUNTS = text("""
+        UPDATE case_chunks cc
+        SET sentence_count = v.sentence_count
+        FROM unnest(CAST(:chunk_ids AS bigint[]), CAST(:counts AS int[])) AS v(chunk_id, sentence_count)
+        WHERE cc.chunk_id = v.chunk_id
+    """)
+    _SQL_UPDATE_CHUNK_SENTENCE_COUNT = text(
+        "UPDATE case_chunks SET sentence_count = :count WHERE chunk_id = :chunk_id"
+    )
+    _SQL_CASE_SENTENCE_STATS = text("""
+        SELECT 
+            COUNT(*) as total_sentences,
+            AVG(word_count) as avg_words_per_sentence,
+            MIN(word_count) as min_words,
+            MAX(word_count) as max_words,
+            SUM(word_count) as total_words
+        FROM case_sentences 
+        WHERE case_id = :case_id
+    """)
+    
     def __init__(self, db_engine: Engine):
         self.db = db_engine
     
@@ -31,30 +157,20 @@ class SentenceProcessor:
         # Enhanced sentence splitting for legal text
         # Legal documents often have complex punctuation and citations
         
-        # First, protect citations and case references
-        protected_patterns = [
-            r'\d+\s+P\.\s*\d+d?\s+\d+',  # Pacific Reporter citations
-            r'\d+\s+Wn\.\s*\d*\s+\d+',   # Washington Reports
-            r'\d+\s+U\.S\.\s+\d+',       # U.S. Reports
-            r'RCW\s+\d+\.\d+\.\d+',      # RCW statutes
-            r'WAC\s+\d+\-\d+\-\d+',     # WAC regulations
-        ]
-        
-        text = chunk_text
+        # First, protect citations and case references (single pass over the chunk)
         protections = {}
         
-        # Protect citations from splitting
-        for i, pattern in enumerate(protected_patterns):
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                placeholder = f"__CITATION_{i}_{len(protections)}__"
-                protections[placeholder] = match.group()
-                text = text.replace(match.group(), placeholder)
+        def _protect(match):
+            placeholder = f"__CIT_{len(protections)}__"
+            protections[placeholder] = match.group(0)
+            return placeholder
         
-        # Split on sentence boundaries
-        # Look for periods, question marks, exclamation points followed by space and capital letter
-        sentence_pattern = r'(?<=[.!?])\s+(?=[A-Z])'
-        raw_sentences = re.split(sentence_pattern, text)
+        text = _CITATION_RE.sub(_protect, chunk_text)
+        
+        # Split on sentence boundaries (regex by default, NUPunkt if configured).
+        # Citation protection is kept for both: reporter/RCW/WAC periods are
+        # the splits we most need to avoid.
+        raw_sentences = _split_raw_sentences(text)
         
         sentences = []
         for i, sent in enumerate(raw_sentences):
@@ -63,28 +179,27 @@ class SentenceProcessor:
                 continue
             
             # Restore protected citations
-            for placeholder, original in protections.items():
-                sent = sent.replace(placeholder, original)
+            if protections:
+                sent = _PLACEHOLDER_RE.sub(lambda m: protections[m.group(0)], sent)
             
             # Skip very short sentences (likely fragments)
-            if len(sent) < 10:
+            length = len(sent)
+            if length < 10:
                 continue
             
-            # Count words
-            word_count = len(sent.split())
-            
             sentences.append({
                 'text': sent,
                 'sentence_order': i + 1,
-                'word_count': word_count,
-                'length': len(sent)
+                'word_count': len(_WS_COUNT(sent)),
+                'length': length
             })
         
         return sentences
     
     def process_chunk_sentences(self, case_id: int, chunk_id: int, chunk_text: str, 
                                document_id: Optional[int] = None, 
-                               global_sentence_counter: int = 0) -> List[Dict[str, Any]]:
+                               global_sentence_counter: int = 0,
+                               conn: Optional[Connection] = None) -> List[Dict[str, Any]]:
         """
         Process chunk into sentences and create database records
         
@@ -94,6 +209,8 @@ class SentenceProcessor:
             chunk_text: Text content
             document_id: Optional document ID
             global_sentence_counter: Starting counter for global sentence order
+            conn: Optional open connection; when given, rows are written inside the
+                  caller's transaction (no commit here) and errors propagate
             
         Returns:
             List of created sentence records with IDs
@@ -108,78 +225,123 @@ class SentenceProcessor:
             
             logger.info(f"Split chunk {chunk_id} into {len(sentences)} sentences")
             
-            # Create sentence records
-            sentence_records = []
+            # Build one parameter list and insert all sentences in a single batched statement
+            params = [
+                {
+                    'case_id': case_id,
+                    'chunk_id': chunk_id,
+                    'document_id': document_id,
+                    'sentence_order': sentence_data['sentence_order'],
+                    'global_sentence_order': global_sentence_counter + i + 1,
+                    'text': sentence_data['text'],
+                    'word_count': sentence_data['word_count']
+                }
+                for i, sentence_data in enumerate(sentences)
+            ]
             
-            with self.db.connect() as conn:
-                for sentence_data in sentences:
-                    # Skip sentence embeddings - too expensive and not needed!
-                    embedding_list = None
-                    
-                    # Insert sentence record
-                    insert_query = text("""
-                        INSERT INTO case_sentences (
-                            case_id, chunk_id, document_id, sentence_order, 
-                            global_sentence_order, text, word_count,
-                            created_at, updated_at
-                        ) VALUES (
-                            :case_id, :chunk_id, :document_id, :sentence_order,
-                            :global_sentence_order, :text, :word_count,
-                            NOW(), NOW()
-                        )
-                        RETURNING sentence_id
-                    """)
-                    
-                    global_sentence_counter += 1
-                    
-                    try:
-                        result = conn.execute(insert_query, {
-                            'case_id': case_id,
-                            'chunk_id': chunk_id,
-                            'document_id': document_id,
-                            'sentence_order': sentence_data['sentence_order'],
-                            'global_sentence_order': global_sentence_counter,
-                            'text': sentence_data['text'],
-                            'word_count': sentence_data['word_count']
-                        })
-                        
-                        sentence_id = result.fetchone().sentence_id
-                        
-                        # Add to results
-                        sentence_record = {
-                            'sentence_id': sentence_id,
-                            'case_id': case_id,
-                            'chunk_id': chunk_id,
-                            'document_id': document_id,
-                            'sentence_order': sentence_data['sentence_order'],
-                            'global_sentence_order': global_sentence_counter,
-                            'text': sentence_data['text'],
-                            'word_count': sentence_data['word_count'],
-                            'embedding': embedding_list
-                        }
-                        sentence_records.append(sentence_record)
-                        
-                    except Exception as e:
-                        logger.error(f"Failed to insert sentence: {e}")
-                        continue
-                
-                # Commit all sentences
-                conn.commit()
+            if conn is None:
+                with self.db.begin() as own_conn:
+                    sentence_ids = own_conn.execute(_insert_sentences, params).scalars().all()
+            else:
+                sentence_ids = conn.execute(_insert_sentences, params).scalars().all()
+            
+            # Skip sentence embeddings - too expensive and not needed!
+            sentence_records = [
+                {'sentence_id': sentence_id, **row, 'embedding': None}
+                for sentence_id, row in zip(sentence_ids, params)
+            ]
                 
             logger.info(f"Created {len(sentence_records)} sentence records for chunk {chunk_id}")
             return sentence_records
             
         except Exception as e:
+            if conn is not None:
+                raise
             logger.error(f"Error processing sentences for chunk {chunk_id}: {e}")
             return []
     
-    def update_chunk_sentence_count(self, chunk_id: int, sentence_count: int) -> None:
-        """Update the sentence count for a chunk"""
+    def process_case_sentences_bulk(self, case_id: int, chunks: List[Tuple[int, str]],
+                                    document_id: Optional[int] = None,
+                                    global_sentence_counter: int = 0,
+                                    conn: Optional[Connection] = None,
+                                    use_copy: bool = False) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Split every chunk of a case and insert all sentences in one batched INSERT.
+        
+        Bulk counterpart of process_chunk_sentences (which remains for single
+        chunks). insertmanyvalues pages the rows by insertmanyvalues_page_size.
+        
+        Args:
+            case_id: Case ID
+            chunks: (chunk_id, chunk_text) pairs in document order
+            document_id: Optional document ID
+            global_sentence_counter: Starting counter for global sentence order
+            conn: Optional open connection; when given, rows are written inside the
+                  caller's transaction (no commit here)
+            use_copy: Load rows with COPY instead of INSERT (initial case loads)
+            
+        Returns:
+            Mapping of chunk_id -> created sentence records with IDs
+        """
+        # global_sentence_order is assigned by position in the case-wide row list
+        params = [
+            {
+                'case_id': case_id,
+                'chunk_id': chunk_id,
+                'document_id': document_id,
+                'sentence_order': sentence_data['sentence_order'],
+                'text': sentence_data['text'],
+                'word_count': sentence_data['word_count']
+            }
+            for chunk_id, chunk_text in chunks
+            for sentence_data in self.split_chunk_into_sentences(chunk_text)
+        ]
+        for i, row in enumerate(params, start=global_sentence_counter + 1):
+            row['global_sentence_order'] = i
+        
+        records_by_chunk: Dict[int, List[Dict[str, Any]]] = {chunk_id: [] for chunk_id, _ in chunks}
+        if not params:
+            return records_by_chunk
+        
+        write_rows = copy_sentence_rows if use_copy else self._insert_sentence_rows
+        if conn is None:
+            with self.db.begin() as own_conn:
+                stored = write_rows(own_conn, params)
+        else:
+            stored = write_rows(conn, params)
+        
+        # (sentence_id, row) pairs keep parameter order, so each id maps straight back to its chunk
+        for sentence_id, row in stored:
+            records_by_chunk[row['chunk_id']].append({'sentence_id': sentence_id, **row, 'embedding': None})
+        
+        logger.info(f"Created {len(stored)} sentence records across {len(chunks)} chunks for case {case_id}")
+        return records_by_chunk
+    
+    def _insert_sentence_rows(self, conn: Connection,
+                              params: List[Dict[str, Any]]) -> List[Tuple[int, Dict[str, Any]]]:
+        """Batched INSERT ... RETURNING -> (sentence_id, row) pairs in parameter order"""
+        return list(zip(conn.execute(_insert_sentences, params).scalars().all(), params))
+    
+    def update_chunk_sentence_counts(self, counts: Dict[int, int], conn: Connection) -> None:
+        """Update sentence_count for many chunks with one statement"""
+        if not counts:
+            return
+        conn.execute(self._SQL_UPDATE_CHUNK_SENTENCE_COUNTS, {'chunk_ids': list(counts.keys()), 'counts': list(counts.values())})
+    
+    def update_chunk_sentence_count(self, chunk_id: int, sentence_count: int,
+                                    conn: Optional[Connection] = None) -> None:
+        """Update the sentence count for a chunk (inside the caller's transaction if conn is given)"""
+        query = self._SQL_UPDATE_CHUNK_SENTENCE_COUNT
+        params = {'count': sentence_count, 'chunk_id': chunk_id}
+        
+        if conn is not None:
+            conn.execute(query, params)
+            logger.debug(f"Updated chunk {chunk_id} sentence count to {sentence_count}")
+            return
+        
         try:
-            with self.db.connect() as conn:
-                query = text("UPDATE case_chunks SET sentence_count = :count WHERE chunk_id = :chunk_id")
-                conn.execute(query, {'count': sentence_count, 'chunk_id': chunk_id})
-                conn.commit()
+            with self.db.begin() as conn:
+                conn.execute(query, params)
                 logger.debug(f"Updated chunk {chunk_id} sentence count to {sentence_count}")
         except Exception as e:
             logger.error(f"Failed to update chunk sentence count: {e}")
@@ -188,18 +350,7 @@ class SentenceProcessor:
         """Get sentence statistics for a case"""
         try:
             with self.db.connect() as conn:
-                query = text("""
-                    SELECT 
-                        COUNT(*) as total_sentences,
-                        AVG(word_count) as avg_words_per_sentence,
-                        MIN(word_count) as min_words,
-                        MAX(word_count) as max_words,
-                        SUM(word_count) as total_words
-                    FROM case_sentences 
-                    WHERE case_id = :case_id
-                """)
-                
-                result = conn.execute(query, {'case_id': case_id})
+                result = conn.execute(self._SQL_CASE_SENTENCE_STATS, {'case_id': case_id})
                 row = result.fetchone()
                 
                 if row:
@@ -3,18 +3,186 @@ Word processing for word dictionary and occurrence tracking
 This enables precise phrase queries and word-level indexing for RAG
 """
 
+import os
 import re
 import logging
-from typing import List, Dict, Tuple, Set, Optional
-from collections import Counter
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import List, Dict, Tuple, Set, FrozenSet, Iterable, Iterator, Optional
 from sqlalchemy import text
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Engine, Connection
 
 logger = logging.getLogger(__name__)
 
+# Tokenizer patterns compiled once at import. The regex only runs on non-ASCII
+# text (see below), so it must stay on stdlib re, whose \w and \b are Unicode-aware
+_TOKEN_RE = re.compile(r"\b[\w'-]+\b")
+# Pure-ASCII text (nearly all opinions) skips the regex engine: every ASCII
+# character outside [\w'-] is translated to a space, so str.split() yields the
+# maximal [\w'-] runs; stripping edge apostrophes/hyphens from a run gives exactly
+# the \b-bounded match of the token pattern
+_ASCII_SEPARATORS = str.maketrans({
+    chr(c): ' ' for c in range(128)
+    if not (chr(c).isalnum() or chr(c) in "_'-" or chr(c).isspace())
+})
+_HAS_LETTER = re.compile(r'[a-z]').search
+# Most tokens start with a letter; checking the first character against this set
+# answers the has-letter test without entering the regex engine
+_ASCII_LOWER = frozenset('abcdefghijklmnopqrstuvwxyz')
+
+
+def _iter_tokens(text: str) -> Iterator[str]:
+    """Yield normalized word tokens lazily so callers can fuse their own pass over them"""
+    if not text:
+        return
+        
+    # Normalize text, then split on whitespace and punctuation while preserving
+    # legal terms: keep hyphens in compound words, apostrophes in contractions
+    text = text.lower()
+    if text.isascii():
+        tokens = [run.strip("'-") for run in text.translate(_ASCII_SEPARATORS).split()]
+    else:
+        tokens = _TOKEN_RE.findall(text)
+    
+    for token in tokens:
+        # Keep if it's at least 2 characters and contains at least one letter
+        if len(token) >= 2 and (token[0] in _ASCII_LOWER or _HAS_LETTER(token)):
+            # Remove possessive 's (tokens always end on a word character,
+            # so a bare trailing apostrophe cannot occur)
+            if token.endswith("'s"):
+                token = token[:-2]
+            if token:  # Make sure it's not empty after cleaning
+                yield token
+
+
+def _tokenize(text: str) -> List[str]:
+    """Module-level tokenizer shared by WordProcessor and the token memo"""
+    return list(_iter_tokens(text))
+
+
+# Per-process memo of short sentence text -> (tokens, unique). Legal boilerplate
+# ("IT IS SO ORDERED.", captions, signature blocks) repeats across every case, so
+# identical sentences are tokenized once. Long sentences are rarely repeated and
+# are not memoized, which keeps the memo small.
+_TOKEN_MEMO_MAX_TEXT = 200
+_TOKEN_MEMO_MAX_SIZE = 50_000
+_token_memo: Dict[str, Tuple[List[str], FrozenSet[str]]] = {}
+
+
+def _tokenize_memo(text: str) -> Tuple[List[str], FrozenSet[str]]:
+    """Tokenize a sentence, reusing the result for repeated short sentences"""
+    if len(text) > _TOKEN_MEMO_MAX_TEXT:
+        tokens = _tokenize(text)
+        return tokens, frozenset(tokens)
+    
+    cached = _token_memo.get(text)
+    if cached is None:
+        tokens = _tokenize(text)
+        cached = (tokens, frozenset(tokens))
+        if len(_token_memo) >= _TOKEN_MEMO_MAX_SIZE:
+            _token_memo.clear()
+        _token_memo[text] = cached
+    return cached
+
+
+def _tokenize_batch(texts: List[str]) -> Tuple[int, Set[str]]:
+    """Tokenize a batch of sentences in a worker process -> (word count, unique words)"""
+    total_words = 0
+    unique_words: Set[str] = set()
+    for sentence_text in texts:
+        tokens, unique = _tokenize_memo(sentence_text)
+        total_words += len(tokens)
+        unique_words.update(unique)
+    return total_words, unique_words
+
+
+# Tokenizer worker processes, created on the first large case and reused for the
+# life of the process (pool startup is paid once, not per case). 1 disables it.
+_TOKENIZE_WORKERS = int(os.getenv("TOKENIZE_WORKERS", str(min(4, os.cpu_count() or 1))))
+_tokenize_pool: Optional[ProcessPoolExecutor] = None
+_tokenize_pool_lock = threading.Lock()
+
+
+def _get_tokenize_pool() -> Optional[ProcessPoolExecutor]:
+    """The shared tokenizer pool, or None when TOKENIZE_WORKERS <= 1"""
+    global _tokenize_pool
+    if _TOKENIZE_WORKERS <= 1:
+        return None
+    with _tokenize_pool_lock:
+        if _tokenize_pool is None:
+            _tokenize_pool = ProcessPoolExecutor(max_workers=_TOKENIZE_WORKERS)
+        return _tokenize_pool
+
+
 class WordProcessor:
     """Process text for word dictionary and occurrence tracking"""
     
+    # Process-wide word -> word_id cache shared by all instances (word_id never changes)
+    WORD_CACHE_MAX_SIZE = 200_000
+    _word_cache: Dict[str, int] = {}
+    _word_cache_lock = threading.Lock()
+    
+    # Sentences per tokenizer task; cases smaller than one batch stay in-process
+    TOKENIZE_BATCH_SIZE = 2000
+    
+    # SQL compiled once per class; SQLAlchemy's compiled cache reuses them per call
+    _SQL_GET_WORDS = text("""
+        SELECT word_id, word 
+        FROM word_dictionary 
+        WHERE word = ANY(:words)
+    """)
+    # Words are inserted in sorted order so concurrent upserts take row locks in
+    # the same order
+    _SQL_INSERT_WORDS = text("""
+        INSERT INTO word_dictionary (word) 
+        SELECT w FROM unnest(CAST(:words AS text[])) AS w ORDER BY w
+        ON CONFLICT (word) DO UPDATE SET word = EXCLUDED.word
+        RETURNING word_id, word
+    """)
+    # df only counts (word, case) pairs recorded in word_case for the first time.
+    # word_dictionary rows are locked in word_id order (FOR UPDATE under ORDER BY)
+    # so concurrent workers sharing common words queue instead of deadlocking
+    _SQL_INCREMENT_DF = text("""
+        WITH new_members AS (
+            INSERT INTO word_case (word_id, case_id)
+            SELECT w, :case_id FROM unnest(CAST(:word_ids AS int[])) AS w ORDER BY w
+            ON CONFLICT DO NOTHING
+            RETURNING word_id
+        ), locked AS (
+            SELECT wd.word_id
+            FROM word_dictionary wd
+            WHERE wd.word_id IN (SELECT word_id FROM new_members)
+            ORDER BY wd.word_id
+            FOR UPDATE
+        )
+        UPDATE word_dictionary wd
+        SET df = COALESCE(wd.df, 0) + 1
+        FROM locked
+        WHERE wd.word_id = locked.word_id
+    """)
+    _SQL_CASE_SENTENCES = text("""
+        SELECT sentence_id, chunk_id, text 
+        FROM case_sentences 
+        WHERE case_id = :case_id
+        ORDER BY chunk_id, sentence_order
+    """)
+    # Search results page by sentence_id (keyset) so Postgres can walk the primary
+    # key and stop at LIMIT instead of sorting every tsvector match
+    _SQL_FIND_WORD = text("""
+        SELECT cs.case_id, cs.chunk_id, cs.sentence_id, cs.text AS sentence_text
+        FROM case_sentences cs
+        WHERE cs.tsv @@ websearch_to_tsquery('english', :query)
+          AND cs.sentence_id > :after_sentence_id
+        ORDER BY cs.sentence_id LIMIT :limit
+    """)
+    _SQL_FIND_WORD_IN_CASE = text("""
+        SELECT cs.case_id, cs.chunk_id, cs.sentence_id, cs.text AS sentence_text
+        FROM case_sentences cs
+        WHERE cs.tsv @@ websearch_to_tsquery('english', :query) AND cs.case_id = :case_id
+          AND cs.sentence_id > :after_sentence_id
+        ORDER BY cs.sentence_id LIMIT :limit
+    """)
+    
     def __init__(self, db_engine: Engine):
         self.db = db_engine
         
@@ -28,82 +196,104 @@ class WordProcessor:
         Returns:
             List of normalized word tokens
         """
-        if not text:
-            return []
-            
-        # Normalize text
-        text = text.lower()
-        
-        # Split on whitespace and punctuation, but preserve legal terms
-        # Keep hyphens in compound words, apostrophes in contractions
-        tokens = re.findall(r"\b[\w'-]+\b", text)
-        
-        # Filter out very short tokens and numbers-only tokens
-        filtered_tokens = []
-        for token in tokens:
-            # Keep if it's at least 2 characters and contains at least one letter
-            if len(token) >= 2 and re.search(r'[a-zA-Z]', token):
-                # Remove apostrophes at the end (possessives)
-                token = re.sub(r"'s?$", "", token)
-                if token:  # Make sure it's not empty after cleaning
-                    filtered_tokens.append(token)
-        
-        return filtered_tokens
+        return _tokenize(text)
     
-    def get_or_create_word_ids(self, words: List[str]) -> Dict[str, int]:
+    def get_or_create_word_ids(self, words: Iterable[str]) -> Dict[str, int]:
         """
         Get or create word IDs for a list of words
         
+        Lookups and inserts run in their own short transaction, and IDs reach the
+        process-wide cache only after it commits. A caller's transaction rolling
+        back can therefore never leave cached IDs for word_dictionary rows that
+        were never committed.
+        
         Args:
-            words: List of unique words
+            words: List (or set) of unique words
             
         Returns:
             Dictionary mapping word -> word_id
         """
         if not words:
             return {}
-            
+        
+        # Serve common vocabulary from the process-wide cache in a single pass
+        cache_get = self._word_cache.get
         word_to_id = {}
+        unknown = []
+        for word in words:
+            word_id = cache_get(word)
+            if word_id is None:
+                unknown.append(word)
+            else:
+                word_to_id[word] = word_id
         
-        with self.db.connect() as conn:
-            # First, try to get existing words
-            if words:
-                placeholders = ','.join([':word_' + str(i) for i in range(len(words))])
-                query = text(f"""
-                    SELECT word_id, word 
-                    FROM word_dictionary 
-                    WHERE word = ANY(ARRAY[{placeholders}])
-                """)
-                
-                params = {f'word_{i}': word for i, word in enumerate(words)}
-                result = conn.execute(query, params)
-                
-                for row in result:
-                    word_to_id[row.word] = row.word_id
-            
-            # Create new words that don't exist
-            new_words = [word for word in words if word not in word_to_id]
-            
-            if new_words:
-                # Insert new words
-                insert_query = text("""
-                    INSERT INTO word_dictionary (word) 
-                    VALUES (:word)
-                    ON CONFLICT (word) DO UPDATE SET word = EXCLUDED.word
-                    RETURNING word_id, word
-                """)
-                
-                for word in new_words:
-                    result = conn.execute(insert_query, {'word': word})
-                    row = result.fetchone()
-                    word_to_id[word] = row.word_id
-            
-            conn.commit()
+        if not unknown:
+            return word_to_id
+        
+        with self.db.begin() as conn:
+            resolved = self._lookup_or_insert_words(unknown, conn)
+        
+        # Committed: safe to share with every later case
+        self._cache_word_ids(resolved)
+        word_to_id.update(resolved)
+        return word_to_id
+    
+    def _lookup_or_insert_words(self, words: List[str], conn: Connection) -> Dict[str, int]:
+        """Resolve words missing from the cache against word_dictionary"""
+        # First, try to get existing words (one array parameter -> one stable plan)
+        result = conn.execute(self._SQL_GET_WORDS, {'words': list(words)})
+        
+        word_to_id = {row.word: row.word_id for row in result}
+        
+        # Create new words that don't exist (deduplicated: ON CONFLICT DO UPDATE
+        # cannot touch the same row twice in one statement)
+        new_words = [word for word in dict.fromkeys(words) if word not in word_to_id]
+        
+        if new_words:
+            # Insert all new words in a single upsert
+            result = conn.execute(self._SQL_INSERT_WORDS, {'words': new_words})
+            word_to_id.update({row.word: row.word_id for row in result})
         
         return word_to_id
     
+    @classmethod
+    def _cache_word_ids(cls, word_to_id: Dict[str, int]) -> None:
+        """Add committed word IDs to the process-wide cache"""
+        with cls._word_cache_lock:
+            if len(cls._word_cache) + len(word_to_id) > cls.WORD_CACHE_MAX_SIZE:
+                cls._word_cache.clear()
+            cls._word_cache.update(word_to_id)
+    
+    def update_document_frequencies(self, case_id: int, word_ids: Iterable[int], conn: Connection) -> None:
+        """
+        Increment document frequency (df) for the words of a case
+        
+        Called once per case with the case's unique word IDs. Membership is recorded
+        in word_case, and only words new to the case bump df, so re-processing a
+        case leaves df unchanged and no corpus-wide re-aggregation is needed.
+        
+        The UPDATE locks word_dictionary rows shared by every case, so conn should
+        be a short transaction of its own: locks held for the length of a case
+        transaction would serialize parallel ingestion workers.
+        
+        Args:
+            case_id: Case identifier
+            word_ids: The case's distinct word IDs
+            conn: Open connection (preferably a dedicated short transaction)
+        """
+        word_ids = sorted(word_ids)
+        if word_ids:
+            conn.execute(self._SQL_INCREMENT_DF, {'case_id': case_id, 'word_ids': word_ids})
+    
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Clear the process-wide word ID cache"""
+        with cls._word_cache_lock:
+            cls._word_cache.clear()
+    
     def process_sentence_words(self, case_id: int, chunk_id: int, sentence_id: int, 
-                              sentence_text: str, document_id: Optional[int] = None) -> Dict[str, any]:
+                              sentence_text: str, document_id: Optional[int] = None,
+                              tokens: Optional[List[str]] = None) -> Dict[str, any]:
         """
         Process a sentence's text for word occurrences
         
@@ -113,48 +303,52 @@ class WordProcessor:
             sentence_id: Sentence identifier  
             sentence_text: Sentence text content
             document_id: Document identifier
+            tokens: Optional precomputed tokens for sentence_text (skips tokenizing)
             
         Returns:
-            Dictionary with processing stats
+            Dictionary with processing stats; 'word_ids' holds the IDs of the
+            sentence's distinct words so callers don't need to re-tokenize
         """
         if not sentence_text:
-            return {'words_processed': 0, 'unique_words': 0}
-            
-        # Tokenize the sentence text
-        tokens = self.tokenize_text(sentence_text)
-        
-        if not tokens:
-            return {'words_processed': 0, 'unique_words': 0}
-        
-        # Get unique words
-        unique_words = list(set(tokens))
-        
-        # Get or create word IDs
-        word_to_id = self.get_or_create_word_ids(unique_words)
+            return {'words_processed': 0, 'unique_words': 0, 'word_ids': ()}
         
-        # Create word occurrences (positions are relative to sentence, not chunk)
-        word_occurrences = []
-        for position, word in enumerate(tokens):
-            if word in word_to_id:
-                word_occurrences.append({
-                    'word_id': word_to_id[word],
-                    'case_id': case_id,
-                    'chunk_id': chunk_id,
-                    'sentence_id': sentence_id,
-                    'document_id': document_id,
-                    'position': position  # Position within sentence (0-based)
-                })
+        # Get or create word IDs (occurrences are no longer stored: the
+        # word_occurrence table was dropped in migration 018 in favour of tsvector)
+        if tokens is not None or len(sentence_text) <= _TOKEN_MEMO_MAX_TEXT:
+            if tokens is None:
+                # Short sentences are often repeated boilerplate; reuse their tokens
+                tokens, unique_tokens = _tokenize_memo(sentence_text)
+            else:
+                unique_tokens = dict.fromkeys(tokens).keys()
+            words_processed = len(tokens)
+            if not words_processed:
+                return {'words_processed': 0, 'unique_words': 0, 'word_ids': ()}
+            word_to_id = self.get_or_create_word_ids(unique_tokens)
+        else:
+            # Tokenize, count, deduplicate and resolve cached IDs in one pass;
+            # only the cache misses are sent on to the dictionary
+            cache_get = self._word_cache.get
+            words_processed = 0
+            word_to_id = {}
+            missing = []
+            for word in _iter_tokens(sentence_text):
+                words_processed += 1
+                if word not in word_to_id:
+                    word_id = cache_get(word)
+                    word_to_id[word] = word_id
+                    if word_id is None:
+                        missing.append(word)
+            if not words_processed:
+                return {'words_processed': 0, 'unique_words': 0, 'word_ids': ()}
+            if missing:
+                word_to_id.update(self.get_or_create_word_ids(missing))
         
-        # Insert word occurrences in batches
-        if word_occurrences:
-            self._insert_word_occurrences(word_occurrences)
-        
-        logger.debug(f"Processed {len(tokens)} words, {len(unique_words)} unique for sentence {sentence_id}")
+        logger.debug(f"Processed {words_processed} words, {len(word_to_id)} unique for sentence {sentence_id}")
         
         return {
-            'words_processed': len(tokens),
-            'unique_words': len(unique_words),
-            'word_occurrences': len(word_occurrences)
+            'words_processed': words_processed,
+            'unique_words': len(word_to_id),
+            'word_ids': word_to_id.values()
         }
     
     def process_case_sentences_words(self, case_id: int, document_id: Optional[int] = None) -> Dict[str, int]:
@@ -169,46 +363,66 @@ class WordProcessor:
             Dictionary with processing stats
         """
         total_words = 0
+        sentences_processed = 0
         unique_words = set()
         
+        def merge(batch_result: Tuple[int, Set[str]]) -> None:
+            nonlocal total_words
+            batch_words, batch_unique = batch_result
+            total_words += batch_words
+            unique_words.update(batch_unique)
+        
         try:
+            logger.info(f"Processing words for sentences in case {case_id}")
+            
+            # Rows are streamed through a server-side cursor in batches. Full
+            # batches go to the shared tokenizer pool with at most two tasks per
+            # worker in flight, so memory stays bounded; the remainder (all of a
+            # small case) is tokenized here. Only the read-only SELECT is open
+            # during the fan-out; dictionary writes happen afterwards.
+            pool = None
+            in_flight = set()
+            batch: List[str] = []
             with self.db.connect() as conn:
-                # Get all sentences for this case
-                query = text("""
-                    SELECT sentence_id, chunk_id, text 
-                    FROM case_sentences 
-                    WHERE case_id = :case_id
-                    ORDER BY chunk_id, sentence_order
-                """)
-                
-                result = conn.execute(query, {'case_id': case_id})
-                sentences = result.fetchall()
-                
-                logger.info(f"Processing words for {len(sentences)} sentences in case {case_id}")
-                
-                for sentence in sentences:
-                    sentence_stats = self.process_sentence_words(
-                        case_id=case_id,
-                        chunk_id=sentence.chunk_id,
-                        sentence_id=sentence.sentence_id,
-                        sentence_text=sentence.text,
-                        document_id=document_id
-                    )
-                    
-                    total_words += sentence_stats['words_processed']
-                    
-                    # Get unique words from this sentence
-                    tokens = self.tokenize_text(sentence.text)
-                    unique_words.update(tokens)
-                
-                logger.info(f"Completed word processing: {total_words} total words, {len(unique_words)} unique")
-                
-                return {
-                    'total_words': total_words,
-                    'unique_words': len(unique_words),
-                    'sentences_processed': len(sentences)
-                }
-                
+                result = conn.execute(
+                    self._SQL_CASE_SENTENCES, {'case_id': case_id},
+                    execution_options={'stream_results': True, 'yield_per': 500}
+                )
+                for row in result:
+                    if not row.text:
+                        continue
+                    sentences_processed += 1
+                    batch.append(row.text)
+                    if len(batch) < self.TOKENIZE_BATCH_SIZE:
+                        continue
+                    pool = pool or _get_tokenize_pool()
+                    if pool is None:
+                        merge(_tokenize_batch(batch))
+                    else:
+                        in_flight.add(pool.submit(_tokenize_batch, batch))
+                        if len(in_flight) >= 2 * _TOKENIZE_WORKERS:
+                            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                merge(future.result())
+                    batch = []
+            
+            if batch:
+                merge(_tokenize_batch(batch))
+            for future in in_flight:
+                merge(future.result())
+            
+            # One dictionary round-trip for the whole case, after the read
+            # connection is released (runs in its own short transaction)
+            self.get_or_create_word_ids(unique_words)
+            
+            logger.info(f"Completed word processing: {sentences_processed} sentences, {total_words} total words, {len(unique_words)} unique")
+            
+            return {
+                'total_words': total_words,
+                'unique_words': len(unique_words),
+                'sentences_processed': sentences_processed
+            }
+            
         except Exception as e:
             logger.error(f"Error processing sentence words for case {case_id}: {e}")
             return {
@@ -217,28 +431,18 @@ class WordProcessor:
                 'sentences_processed': 0
             }
     
-    def _insert_word_occurrences(self, word_occurrences: List[Dict]) -> None:
-        """Insert word occurrences in batch with new sentence-based schema
-        
-        NOTE: word_occurrence table was dropped in scalability migration (018).
-        We now rely on tsvector columns on case_chunks and case_sentences for full-text search.
-        This method is now a no-op but kept for API compatibility.
-        """
-        # word_occurrence table removed - using tsvector instead
-        pass
-    
-    def update_word_document_frequencies(self, case_id: int) -> None:
-        """
-        Update document frequency counts for words in a case
-        This should be called after processing all chunks for a case
-        
-        NOTE: word_occurrence table was dropped in scalability migration (018).
-        This method is now a no-op but kept for API compatibility.
-        """
-        # word_occurrence table removed - using tsvector instead
-        logger.debug(f"Skipping document frequency update for case {case_id} (word_occurrence table removed)")
+    def _search_sentences(self, query: str, case_id: Optional[int],
+                          after_sentence_id: int, limit: int) -> List:
+        """Run a websearch_to_tsquery search over case_sentences, one keyset page at a time"""
+        params = {'query': query, 'after_sentence_id': after_sentence_id, 'limit': limit}
+        with self.db.connect() as conn:
+            if case_id:
+                params['case_id'] = case_id
+                return conn.execute(self._SQL_FIND_WORD_IN_CASE, params).fetchall()
+            return conn.execute(self._SQL_FIND_WORD, params).fetchall()
     
-    def find_word_positions(self, word: str, case_id: int = None) -> List[Dict]:
+    def find_word_positions(self, word: str, case_id: int = None,
+                            after_sentence_id: int = 0, limit: int = 1000) -> List[Dict]:
         """
         Find all positions of a word across cases/chunks using tsvector search.
         
@@ -248,38 +452,26 @@ class WordProcessor:
         Args:
             word: Word to search for
             case_id: Optional case ID to limit search
+            after_sentence_id: Keyset cursor; pass the last sentence_id of the previous page
+            limit: Maximum number of results
             
         Returns:
-            List of sentence information where word appears
+            List of sentence information where word appears, ordered by sentence_id
         """
-        with self.db.connect() as conn:
-            base_query = """
-                SELECT cs.case_id, cs.chunk_id, cs.sentence_id, cs.sentence_text
-                FROM case_sentences cs
-                WHERE cs.tsv @@ plainto_tsquery('english', :word)
-            """
-            
-            params = {'word': word.lower()}
-            
-            if case_id:
-                base_query += " AND cs.case_id = :case_id"
-                params['case_id'] = case_id
-            
-            base_query += " ORDER BY cs.case_id, cs.chunk_id, cs.sentence_order LIMIT 1000"
-            
-            result = conn.execute(text(base_query), params)
-            
-            return [
-                {
-                    'case_id': row.case_id,
-                    'chunk_id': row.chunk_id,
-                    'sentence_id': row.sentence_id,
-                    'word': word.lower()
-                }
-                for row in result
-            ]
+        rows = self._search_sentences(word.lower(), case_id, after_sentence_id, limit)
+        
+        return [
+            {
+                'case_id': row.case_id,
+                'chunk_id': row.chunk_id,
+                'sentence_id': row.sentence_id,
+                'word': word.lower()
+            }
+            for row in rows
+        ]
     
-    def find_phrase_positions(self, phrase: str, case_id: int = None) -> List[Dict]:
+    def find_phrase_positions(self, phrase: str, case_id: int = None,
+                              after_sentence_id: int = 0, limit: int = 1000) -> List[Dict]:
         """
         Find all positions where a phrase occurs using tsvector search.
         
@@ -289,34 +481,27 @@ class WordProcessor:
         Args:
             phrase: Phrase to search for (space-separated words)
             case_id: Optional case ID to limit search
+            after_sentence_id: Keyset cursor; pass the last sentence_id of the previous page
+            limit: Maximum number of results
             
         Returns:
-            List of sentence information where phrase appears
+            List of sentence information where phrase appears, ordered by sentence_id
         """
-        with self.db.connect() as conn:
-            # Use phraseto_tsquery for phrase matching
-            base_query = """
-                SELECT cs.case_id, cs.chunk_id, cs.sentence_id, cs.sentence_text
-                FROM case_sentences cs
-                WHERE cs.tsv @@ phraseto_tsquery('english', :phrase)
-            """
-            
-            params = {'phrase': phrase.lower()}
-            
-            if case_id:
-                base_query += " AND cs.case_id = :case_id"
-                params['case_id'] = case_id
-            
-            base_query += " ORDER BY cs.case_id, cs.chunk_id, cs.sentence_order LIMIT 1000"
-            
-            result = conn.execute(text(base_query), params)
-            
-            return [
-                {
-                    'case_id': row.case_id,
-                    'chunk_id': row.chunk_id,
-                    'sentence_id': row.sentence_id,
-                    'phrase': phrase.lower()
-                }
-                for row in result
-            ]
+        words = phrase.lower().replace('"', ' ').split()
+        if len(words) == 1:
+            # Single word: same query as find_word_positions, no phrase operator
+            query = words[0]
+        else:
+            # A quoted websearch query is a phrase (<->) match, same as phraseto_tsquery
+            query = '"' + ' '.join(words) + '"'
+        rows = self._search_sentences(query, case_id, after_sentence_id, limit)
+        
+        return [
+            {
+                'case_id': row.case_id,
+                'chunk_id': row.chunk_id,
+                'sentence_id': row.sentence_id,
+                'phrase': phrase.lower()
+            }
+            for row in rows
+        ]
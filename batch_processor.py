@@ -12,6 +12,7 @@ import csv
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 from dateutil import parser as date_parser
 
@@ -33,6 +34,24 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Per-process BatchProcessor used by pool workers (see _init_worker)
+_worker_processor: Optional['BatchProcessor'] = None
+
+
+def _init_worker() -> None:
+    """Pool initializer: give each worker process its own connections and ingestor"""
+    global _worker_processor
+    # Pooled connections inherited over fork must not be shared with the parent;
+    # drop them here (without closing the parent's sockets) so the worker opens its own
+    engine.dispose(close=False)
+    _worker_processor = BatchProcessor()
+
+
+def _process_pdf_worker(pdf_path: Path) -> bool:
+    """Process one PDF in a worker process"""
+    return _worker_processor.process_pdf_file(pdf_path)
+
+
 class BatchProcessor:
     """Legal case batch processor"""
     
@@ -98,13 +117,17 @@ class BatchProcessor:
             logger.error(f"[FAIL] Failed to process {pdf_path.name}: {str(e)}")
             return False
     
-    def process_directory(self, pdf_dir: Path, limit: Optional[int] = None) -> None:
+    def process_directory(self, pdf_dir: Path, limit: Optional[int] = None, workers: int = 1) -> None:
         """
         Process all PDF files in a directory
         
         Args:
             pdf_dir: Directory containing PDF files
             limit: Optional limit on number of files to process
+            workers: Number of worker processes (1 processes files sequentially).
+                Workers share word_dictionary rows; this relies on WordProcessor
+                locking them in sorted order inside short transactions, which
+                keeps concurrent cases from deadlocking on common words.
         """
         # Find all PDF files
         pdf_files = list(pdf_dir.glob("*.pdf"))
@@ -121,33 +144,53 @@ class BatchProcessor:
         logger.info(f"[FILES] Files to process: {len(pdf_files)}")
         logger.info(f"[MODE] Extraction: Regex (fast, free)")
         logger.info(f"[RAG] RAG Features: Full (chunks + words + phrases + embeddings)")
+        logger.info(f"[WORKERS] Processes: {workers}")
         
         self.start_time = datetime.now()
         
-        # Process files
-        for i, pdf_path in enumerate(pdf_files, 1):
-            logger.info(f"\n{'='*60}")
-            logger.info(f"[FILE] Processing PDF {i}/{len(pdf_files)}: {pdf_path.name}")
-            logger.info(f"{'='*60}")
-            
-            success = self.process_pdf_file(pdf_path)
-            
-            if success:
-                self.processed_count += 1
-            else:
-                self.failed_count += 1
-            
-            # Progress update
-            elapsed = datetime.now() - self.start_time
-            rate = i / elapsed.total_seconds() * 60 if elapsed.total_seconds() > 0 else 0
-            
-            logger.info(f"[STATS] Progress: {i}/{len(pdf_files)} files processed")
-            logger.info(f"[OK] Success: {self.processed_count}, [FAIL] Failed: {self.failed_count}")
-            logger.info(f"[TIME] Rate: {rate:.1f} files/minute")
+        if workers > 1:
+            # Files are independent cases, so they are parsed and ingested in parallel;
+            # each worker process builds its own engine connections and ingestor.
+            # Safe only because the shared word_dictionary rows are upserted and
+            # df-updated in sorted order in short transactions (WordProcessor);
+            # unordered locking there would let two workers deadlock.
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+                futures = {pool.submit(_process_pdf_worker, pdf_path): pdf_path for pdf_path in pdf_files}
+                for i, future in enumerate(as_completed(futures), 1):
+                    try:
+                        success = future.result()
+                    except Exception as e:
+                        logger.error(f"[FAIL] Worker crashed on {futures[future].name}: {str(e)}")
+                        success = False
+                    self._record_file_result(i, len(pdf_files), success)
+        else:
+            # Process files
+            for i, pdf_path in enumerate(pdf_files, 1):
+                logger.info(f"\n{'='*60}")
+                logger.info(f"[FILE] Processing PDF {i}/{len(pdf_files)}: {pdf_path.name}")
+                logger.info(f"{'='*60}")
+                
+                success = self.process_pdf_file(pdf_path)
+                self._record_file_result(i, len(pdf_files), success)
         
         # Final summary
         self._print_final_summary(len(pdf_files))
     
+    def _record_file_result(self, done: int, total: int, success: bool) -> None:
+        """Count one finished file and log progress"""
+        if success:
+            self.processed_count += 1
+        else:
+            self.failed_count += 1
+        
+        # Progress update
+        elapsed = datetime.now() - self.start_time
+        rate = done / elapsed.total_seconds() * 60 if elapsed.total_seconds() > 0 else 0
+        
+        logger.info(f"[STATS] Progress: {done}/{total} files processed")
+        logger.info(f"[OK] Success: {self.processed_count}, [FAIL] Failed: {self.failed_count}")
+        logger.info(f"[TIME] Rate: {rate:.1f} files/minute")
+    
     def _print_final_summary(self, total_files: int) -> None:
         """Print final processing summary"""
         elapsed = datetime.now() - self.start_time
@@ -414,6 +457,9 @@ def main():
     dir_parser = subparsers.add_parser('directory', help='Process all PDFs in a directory')
     dir_parser.add_argument('pdf_directory', help='Directory containing PDF files')
     dir_parser.add_argument('--limit', type=int, help='Limit number of files to process')
+    dir_parser.add_argument('--workers', type=int, default=1,
+                           help=f'Worker processes for parallel ingestion (default: 1, this machine has {os.cpu_count()} CPUs); '
+                                'relies on the sorted word_dictionary locking in WordProcessor')
     
     # CSV mode (new)
     csv_parser = subparsers.add_parser('csv', help='Process PDFs based on metadata CSV')
@@ -444,7 +490,7 @@ def main():
         if not pdf_dir.is_dir():
             logger.error(f"Path is not a directory: {pdf_dir}")
             sys.exit(1)
-        processor.process_directory(pdf_dir, args.limit)
+        processor.process_directory(pdf_dir, args.limit, workers=args.workers)
         
     elif args.mode == 'csv':
         # New CSV-based processing
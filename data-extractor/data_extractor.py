@@ -1,8 +1,15 @@
+import numpy as np
 import pandas as pd
 import psycopg2
 from psycopg2 import sql
-from fuzzywuzzy import fuzz
+from rapidfuzz import fuzz, process
+import csv
 import os
+import queue
+import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from typing import List, Dict, Tuple, Optional
 from dotenv import load_dotenv
 import logging
@@ -14,36 +21,160 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+_WORD_RE = re.compile(r'[^\W_]{3,}')
+
+
+def _longest_word(text: str) -> str:
+    """Longest alphanumeric word (3+ characters) in text, or '' if there is none.
+    Holds no LIKE wildcards, so it can be used in a pattern unescaped"""
+    return max(_WORD_RE.findall(text), key=len, default='')
+
+
 class DataExtractor:
-    def __init__(self, db_config: Dict[str, str]):
+    # Distinct (search text, threshold) results kept for reuse across CSV rows
+    QUERY_CACHE_MAX_SIZE = 1024
+    
+    # Loose pg_trgm word_similarity bound for picking candidate rows server-side;
+    # candidates are then scored with partial_ratio against the real threshold
+    TRGM_CANDIDATE_SIMILARITY = 0.3
+    
+    # Rows fetched per round trip when streaming a table during search
+    SCAN_BATCH_SIZE = 10000
+    
+    # Column layout of the results CSV written by save_results_to_csv
+    RESULT_COLUMNS = (
+        'csv_row_index', 'case_id', 'citation_text', 'relationship_text',
+        'total_matches', 'match_type', 'match_index', 'table_name',
+        'column_name', 'similarity_score', 'matched_text'
+    )
+    
+    def __init__(self, db_config: Dict[str, str], search_workers: int = 1,
+                 ilike_prefilter: bool = False, trgm_prefilter: bool = False):
         """
         Initialize the data extractor with database configuration
         
         Args:
             db_config: Dictionary containing database connection parameters
+            search_workers: Tables searched concurrently, each worker on its own
+                            connection (1 searches tables one by one)
+            ilike_prefilter: Without the trigram prefilter, only fetch rows whose
+                             text columns contain the longest word of the search
+                             text (ILIKE). Approximate: a typo in that word hides the row
+            trgm_prefilter: Only fetch rows with a pg_trgm word-similar text column.
+                            Approximate: word_similarity can reject rows that
+                            partial_ratio would score above the threshold
         """
         self.db_config = db_config
+        self.search_workers = max(1, search_workers)
+        self.ilike_prefilter = ilike_prefilter
+        self.trgm_prefilter = trgm_prefilter
         self.connection = None
         self.cursor = None
+        # Idle worker connections (psycopg2 connections must not be shared by threads)
+        self._worker_connections: Optional[queue.Queue] = None
+        # Schema is static for a run: tables, columns and text columns are read once
+        self._tables: Optional[List[str]] = None
+        self._table_columns: Dict[str, List[str]] = {}
+        self._text_columns: Dict[str, List[str]] = {}
+        # (normalized search text, threshold) -> matches, least recently used first
+        self._query_cache: OrderedDict = OrderedDict()
+        self.trgm_available = False
+        
+    def connect_to_database(self, create_trgm_indexes: bool = False):
+        """
+        Establish connection to PostgreSQL database
         
-    def connect_to_database(self):
-        """Establish connection to PostgreSQL database"""
+        Args:
+            create_trgm_indexes: Create the pg_trgm extension (if missing) and GIN
+                                 trigram indexes on every text column (one-off;
+                                 speeds up the trigram prefilter)
+        """
         try:
-            self.connection = psycopg2.connect(
-                host=self.db_config['host'],
-                database=self.db_config['database'],
-                user=self.db_config['user'],
-                password=self.db_config['password'],
-                port=self.db_config.get('port', 5432)
-            )
+            self.connection = self._open_connection()
             self.cursor = self.connection.cursor()
             logger.info("Successfully connected to PostgreSQL database")
         except Exception as e:
             logger.error(f"Failed to connect to database: {e}")
             raise
+        
+        if self.trgm_prefilter or create_trgm_indexes:
+            self.enable_trigram_search(create_extension=create_trgm_indexes)
+        if create_trgm_indexes and self.trgm_available:
+            self.create_trigram_indexes()
+        
+        if self.search_workers > 1:
+            self._worker_connections = queue.Queue()
+            for _ in range(self.search_workers):
+                conn = self._open_connection()
+                if self._use_trgm_prefilter():
+                    # SET is per session, so every worker needs the candidate bound
+                    with conn.cursor() as cur:
+                        cur.execute("SET pg_trgm.word_similarity_threshold = %s",
+                                    (self.TRGM_CANDIDATE_SIMILARITY,))
+                    conn.commit()
+                self._worker_connections.put(conn)
+            logger.info(f"Opened {self.search_workers} search worker connections")
+    
+    def _open_connection(self):
+        """Open a new PostgreSQL connection from db_config"""
+        return psycopg2.connect(
+            host=self.db_config['host'],
+            database=self.db_config['database'],
+            user=self.db_config['user'],
+            password=self.db_config['password'],
+            port=self.db_config.get('port', 5432)
+        )
+    
+    def enable_trigram_search(self, create_extension: bool = False):
+        """
+        Use pg_trgm so tables can be filtered server-side; falls back to full scans
+        
+        Args:
+            create_extension: Run CREATE EXTENSION when pg_trgm is not installed
+                              (otherwise the database is left unchanged)
+        """
+        try:
+            if create_extension:
+                self.cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            else:
+                self.cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                if self.cursor.fetchone() is None:
+                    raise RuntimeError("extension pg_trgm is not installed")
+            self.cursor.execute("SET pg_trgm.word_similarity_threshold = %s",
+                                (self.TRGM_CANDIDATE_SIMILARITY,))
+            self.connection.commit()
+            self.trgm_available = True
+            logger.info("pg_trgm available for trigram pre-filtering in PostgreSQL")
+        except Exception as e:
+            self.connection.rollback()
+            self.trgm_available = False
+            logger.warning(f"pg_trgm unavailable, fuzzy search will scan whole tables: {e}")
+    
+    def _use_trgm_prefilter(self) -> bool:
+        """Whether searches pre-filter rows with pg_trgm (opted in and available)"""
+        return self.trgm_prefilter and self.trgm_available
+    
+    def create_trigram_indexes(self):
+        """Create a GIN trigram index on every text column of every table"""
+        for table in self.get_all_tables():
+            for col in self.find_text_columns(table):
+                index_name = f"{table}_{col}_trgm_idx"[:63]
+                try:
+                    self.cursor.execute(sql.SQL(
+                        "CREATE INDEX IF NOT EXISTS {} ON {} USING gin ({} gin_trgm_ops)"
+                    ).format(sql.Identifier(index_name), sql.Identifier(table), sql.Identifier(col)))
+                    self.connection.commit()
+                    logger.info(f"Trigram index ready on {table}.{col}")
+                except Exception as e:
+                    self.connection.rollback()
+                    logger.error(f"Error creating trigram index on {table}.{col}: {e}")
     
     def disconnect_from_database(self):
         """Close database connection"""
+        if self._worker_connections is not None:
+            while not self._worker_connections.empty():
+                self._worker_connections.get_nowait().close()
+            self._worker_connections = None
         if self.cursor:
             self.cursor.close()
         if self.connection:
@@ -51,7 +182,9 @@ class DataExtractor:
         logger.info("Disconnected from database")
     
     def get_all_tables(self) -> List[str]:
-        """Get all table names from the database"""
+        """Get all table names from the database (cached for the run)"""
+        if self._tables is not None:
+            return self._tables
         try:
             query = """
             SELECT table_name 
@@ -63,13 +196,17 @@ class DataExtractor:
             self.cursor.execute(query)
             tables = [row[0] for row in self.cursor.fetchall()]
             logger.info(f"Found {len(tables)} tables: {tables}")
+            self._tables = tables
             return tables
         except Exception as e:
             logger.error(f"Error getting tables: {e}")
             raise
     
     def get_table_columns(self, table_name: str) -> List[str]:
-        """Get all column names for a specific table"""
+        """Get all column names for a specific table (cached for the run)"""
+        columns = self._table_columns.get(table_name)
+        if columns is not None:
+            return columns
         try:
             query = """
             SELECT column_name 
@@ -80,13 +217,17 @@ class DataExtractor:
             """
             self.cursor.execute(query, (table_name,))
             columns = [row[0] for row in self.cursor.fetchall()]
+            self._table_columns[table_name] = columns
             return columns
         except Exception as e:
             logger.error(f"Error getting columns for table {table_name}: {e}")
             return []
     
     def find_text_columns(self, table_name: str) -> List[str]:
-        """Find columns that likely contain text data"""
+        """Find columns that likely contain text data (cached per table)"""
+        text_columns = self._text_columns.get(table_name)
+        if text_columns is not None:
+            return text_columns
         try:
             query = """
             SELECT column_name, data_type 
@@ -98,13 +239,15 @@ class DataExtractor:
             self.cursor.execute(query, (table_name,))
             text_columns = [row[0] for row in self.cursor.fetchall()]
             logger.info(f"Found text columns in {table_name}: {text_columns}")
+            self._text_columns[table_name] = text_columns
             return text_columns
         except Exception as e:
             logger.error(f"Error finding text columns for table {table_name}: {e}")
             return []
     
     def search_in_table(self, table_name: str, search_text: str, 
-                       text_columns: List[str], threshold: int = 80) -> List[Dict]:
+                       text_columns: List[str], threshold: int = 80,
+                       connection=None) -> List[Dict]:
         """
         Search for fuzzy matches in a specific table
         
@@ -113,49 +256,135 @@ class DataExtractor:
             search_text: Text to search for
             text_columns: List of text columns to search in
             threshold: Fuzzy matching threshold (0-100)
+            connection: Connection to search on (defaults to the main connection)
             
         Returns:
             List of matching records with similarity scores
         """
         matches = []
+        connection = connection or self.connection
         
         try:
-            # Get all data from the table
-            query = f"SELECT * FROM {table_name}"
-            self.cursor.execute(query)
-            rows = self.cursor.fetchall()
-            
-            # Get column names
-            columns = self.get_table_columns(table_name)
+            if self._use_trgm_prefilter():
+                # Only rows where some text column is trigram-similar to the
+                # search text leave the server (index-assisted with gin_trgm_ops)
+                query = sql.SQL("SELECT * FROM {} WHERE {}").format(
+                    sql.Identifier(table_name),
+                    sql.SQL(" OR ").join(
+                        sql.SQL("%(search)s <%% {}").format(sql.Identifier(col))
+                        for col in text_columns
+                    )
+                )
+                params = {'search': search_text}
+            elif self.ilike_prefilter and (key_word := _longest_word(search_text)):
+                # Cheap substring prefilter on the most selective word of the
+                # search text; fuzzy scoring still decides the matches
+                query = sql.SQL("SELECT * FROM {} WHERE {}").format(
+                    sql.Identifier(table_name),
+                    sql.SQL(" OR ").join(
+                        sql.SQL("{} ILIKE %(pattern)s").format(sql.Identifier(col))
+                        for col in text_columns
+                    )
+                )
+                params = {'pattern': f"%{key_word}%"}
+            else:
+                # Get all data from the table
+                query = sql.SQL("SELECT * FROM {}").format(sql.Identifier(table_name))
+                params = None
             
-            for row in rows:
-                row_dict = dict(zip(columns, row))
+            # Stream the table through a server-side cursor so only one batch
+            # of rows is held in memory at a time
+            scan = connection.cursor(name=f"scan_{table_name}"[:63])
+            scan.itersize = self.SCAN_BATCH_SIZE
+            try:
+                scan.execute(query, params)
+                rows = scan.fetchmany(self.SCAN_BATCH_SIZE)
                 
-                # Check each text column for fuzzy matches
-                for col in text_columns:
-                    if col in row_dict and row_dict[col] is not None:
-                        text_value = str(row_dict[col]).strip()
-                        if text_value:
-                            # Calculate fuzzy match score
-                            similarity = fuzz.partial_ratio(search_text.lower(), text_value.lower())
-                            
-                            if similarity >= threshold:
-                                match_info = {
-                                    'table_name': table_name,
-                                    'column_name': col,
-                                    'similarity_score': similarity,
-                                    'matched_text': text_value,
-                                    'search_text': search_text,
-                                    'record_data': row_dict
-                                }
-                                matches.append(match_info)
-                                logger.info(f"Found match in {table_name}.{col} with {similarity}% similarity")
+                # Column names come back with the result (a named cursor fills in
+                # description on its first fetch), so information_schema isn't queried
+                columns = [col.name for col in scan.description]
+                # Positions of the searched columns in each row tuple, resolved once
+                # per table so the scan indexes rows directly
+                text_col_positions = [(col, columns.index(col)) for col in text_columns if col in columns]
+                
+                while rows:
+                    matches.extend(self._match_rows(table_name, search_text, columns,
+                                                    text_col_positions, rows, threshold))
+                    rows = scan.fetchmany(self.SCAN_BATCH_SIZE)
+            finally:
+                scan.close()
             
         except Exception as e:
             logger.error(f"Error searching in table {table_name}: {e}")
         
         return matches
     
+    def _search_table_on_worker(self, table_name: str, search_text: str,
+                                text_columns: List[str], threshold: int) -> List[Dict]:
+        """Search one table on a worker connection borrowed from the pool"""
+        conn = self._worker_connections.get()
+        try:
+            return self.search_in_table(table_name, search_text, text_columns, threshold, conn)
+        finally:
+            # End the read transaction before handing the connection back
+            conn.rollback()
+            self._worker_connections.put(conn)
+    
+    def _match_rows(self, table_name: str, search_text: str, columns: List[str],
+                    text_col_positions: List[Tuple[str, int]], rows: List[Tuple],
+                    threshold: int) -> List[Dict]:
+        """Score one batch of rows; record dicts are only built for matching cells"""
+        search_lower = search_text.lower()
+        
+        # Flatten every non-empty searched cell of the batch, in table row order.
+        # Cells repeat a lot (court names, statuses, boilerplate), so each distinct
+        # value is lowercased and scored once and cells point at it by index
+        distinct: Dict[str, int] = {}
+        cell_keys = []
+        cells = []
+        for row_idx, row in enumerate(rows):
+            for col, col_idx in text_col_positions:
+                value = row[col_idx]
+                if value is None:
+                    continue
+                text_value = str(value).strip()
+                if text_value:
+                    cell_keys.append(distinct.setdefault(text_value, len(distinct)))
+                    cells.append((row_idx, col, text_value))
+        
+        if not cells:
+            return []
+        
+        # Score the whole batch in one RapidFuzz call across all cores; scores
+        # under the cutoff come back as 0. float64 keeps the exact double scores
+        # process.extract reported, so ">= threshold" keeps the same cells
+        haystack = [value.lower() for value in distinct]
+        distinct_scores = process.cdist([search_lower], haystack, scorer=fuzz.partial_ratio,
+                                        score_cutoff=threshold, dtype=np.float64,
+                                        workers=-1)[0]
+        scores = distinct_scores[np.fromiter(cell_keys, dtype=np.intp, count=len(cell_keys))]
+        hits = [
+            (cells[i][0], cells[i][1], float(scores[i]), cells[i][2])
+            for i in np.flatnonzero(scores >= threshold)
+        ]
+        
+        matches = []
+        for row_idx, col, similarity, text_value in hits:
+            match_info = {
+                'table_name': table_name,
+                'column_name': col,
+                'similarity_score': similarity,
+                'matched_text': text_value,
+                'search_text': search_text,
+                'record_data': dict(zip(columns, rows[row_idx]))
+            }
+            matches.append(match_info)
+            # Per-match/per-row lines are DEBUG with lazy %-args: nothing is
+            # formatted unless DEBUG is enabled
+            logger.debug("Found match in %s.%s with %.1f%% similarity", table_name, col, similarity)
+        
+        return matches
+    
     def search_all_tables(self, search_text: str, threshold: int = 80) -> List[Dict]:
         """
         Search for fuzzy matches across all tables in the database
@@ -167,22 +396,52 @@ class DataExtractor:
         Returns:
             List of all matches across all tables
         """
+        # Citation CSVs repeat the same strings across rows; scoring is done on
+        # lowercased text, so repeats can reuse the earlier matches
+        cache_key = (search_text.strip().lower(), threshold)
+        cached = self._query_cache.get(cache_key)
+        if cached is not None:
+            self._query_cache.move_to_end(cache_key)
+            logger.debug("Reusing %d cached matches for: '%s'", len(cached), search_text)
+            return [dict(match, search_text=search_text) for match in cached]
+        
         all_matches = []
         tables = self.get_all_tables()
         
-        logger.info(f"Starting search across {len(tables)} tables for: '{search_text}'")
+        logger.debug("Starting search across %d tables for: '%s'", len(tables), search_text)
         
+        searchable = []
         for table in tables:
             text_columns = self.find_text_columns(table)
             if text_columns:
+                searchable.append((table, text_columns))
+        
+        if self._worker_connections is not None and len(searchable) > 1:
+            # Table scans are independent and mostly wait on the server, and
+            # RapidFuzz scoring releases the GIL, so threads overlap them
+            with ThreadPoolExecutor(max_workers=self.search_workers) as executor:
+                futures = [
+                    executor.submit(self._search_table_on_worker, table, search_text,
+                                    text_columns, threshold)
+                    for table, text_columns in searchable
+                ]
+                # Collected in table order so ties keep the serial ordering
+                for future in futures:
+                    all_matches.extend(future.result())
+        else:
+            for table, text_columns in searchable:
                 matches = self.search_in_table(table, search_text, text_columns, threshold)
                 all_matches.extend(matches)
         
         # Sort by similarity score (highest first)
         all_matches.sort(key=lambda x: x['similarity_score'], reverse=True)
         
-        logger.info(f"Found {len(all_matches)} total matches")
-        return all_matches
+        logger.debug("Found %d total matches", len(all_matches))
+        
+        self._query_cache[cache_key] = all_matches
+        if len(self._query_cache) > self.QUERY_CACHE_MAX_SIZE:
+            self._query_cache.popitem(last=False)
+        return [dict(match) for match in all_matches]
     
     def load_csv_data(self, csv_file_path: str) -> pd.DataFrame:
         """
@@ -222,20 +481,34 @@ class DataExtractor:
         """
         results = []
         
-        for index, row in df.iterrows():
-            citation_text = str(row.get(citation_text_col, '')).strip()
-            relationship_text = str(row.get(relationship_col, '')).strip()
-            case_id = row.get(case_id_col, '')
-            
-            # Search for citation text matches
-            citation_matches = []
-            if citation_text and citation_text != 'nan':
-                citation_matches = self.search_all_tables(citation_text, threshold)
+        # Read the three columns once instead of building a Series per row
+        # (a missing column reads as '' for every row, as row.get did)
+        def column_values(col: str, as_text: bool) -> list:
+            if col not in df.columns:
+                return [''] * len(df)
+            if as_text:
+                return df[col].astype(str).str.strip().tolist()
+            return df[col].tolist()
+        
+        citations = column_values(citation_text_col, as_text=True)
+        relationships = column_values(relationship_col, as_text=True)
+        case_ids = column_values(case_id_col, as_text=False)
+        
+        # Resolve every distinct search string once, in first-seen order, then
+        # project the matches back onto the rows that use it
+        unique_texts = dict.fromkeys(
+            text for text in chain(citations, relationships) if text and text != 'nan'
+        )
+        logger.info(f"Searching {len(unique_texts)} distinct texts for {len(df)} CSV rows")
+        matches_by_text = {text: self.search_all_tables(text, threshold) for text in unique_texts}
+        
+        for index, citation_text, relationship_text, case_id in zip(
+                df.index, citations, relationships, case_ids):
             
-            # Search for relationship text matches
-            relationship_matches = []
-            if relationship_text and relationship_text != 'nan':
-                relationship_matches = self.search_all_tables(relationship_text, threshold)
+            # Matches for citation and relationship text (rows with the same
+            # text share one match list)
+            citation_matches = matches_by_text.get(citation_text, [])
+            relationship_matches = matches_by_text.get(relationship_text, [])
             
             result = {
                 'csv_row_index': index,
@@ -249,10 +522,11 @@ class DataExtractor:
             
             results.append(result)
             
-            logger.info(f"Processed row {index} (Case ID: {case_id}) - "
-                       f"Found {len(citation_matches)} citation matches, "
-                       f"{len(relationship_matches)} relationship matches")
+            logger.debug("Processed row %s (Case ID: %s) - Found %d citation matches, "
+                         "%d relationship matches", index, case_id,
+                         len(citation_matches), len(relationship_matches))
         
+        logger.info(f"Processed {len(results)} CSV rows")
         return results
     
     def save_results_to_csv(self, results: List[Dict], output_file: str):
@@ -264,60 +538,35 @@ class DataExtractor:
             output_file: Path to output CSV file
         """
         try:
-            # Flatten results for CSV export
-            flattened_results = []
-            
-            for result in results:
-                base_data = {
-                    'csv_row_index': result['csv_row_index'],
-                    'case_id': result['case_id'],
-                    'citation_text': result['citation_text'],
-                    'relationship_text': result['relationship_text'],
-                    'total_matches': result['total_matches']
-                }
-                
-                # Add citation matches
-                for i, match in enumerate(result['citation_matches']):
-                    match_data = base_data.copy()
-                    match_data.update({
-                        'match_type': 'citation',
-                        'match_index': i,
-                        'table_name': match['table_name'],
-                        'column_name': match['column_name'],
-                        'similarity_score': match['similarity_score'],
-                        'matched_text': match['matched_text']
-                    })
-                    flattened_results.append(match_data)
-                
-                # Add relationship matches
-                for i, match in enumerate(result['relationship_matches']):
-                    match_data = base_data.copy()
-                    match_data.update({
-                        'match_type': 'relationship',
-                        'match_index': i,
-                        'table_name': match['table_name'],
-                        'column_name': match['column_name'],
-                        'similarity_score': match['similarity_score'],
-                        'matched_text': match['matched_text']
-                    })
-                    flattened_results.append(match_data)
+            # Flatten results and stream each output row straight to disk, so
+            # memory doesn't grow with the number of matches
+            with open(output_file, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(self.RESULT_COLUMNS)
                 
-                # If no matches, add a row with just the base data
-                if result['total_matches'] == 0:
-                    match_data = base_data.copy()
-                    match_data.update({
-                        'match_type': 'none',
-                        'match_index': 0,
-                        'table_name': '',
-                        'column_name': '',
-                        'similarity_score': 0,
-                        'matched_text': ''
-                    })
-                    flattened_results.append(match_data)
+                for result in results:
+                    case_id = result['case_id']
+                    base_values = (
+                        result['csv_row_index'],
+                        '' if pd.isna(case_id) else case_id,  # NaN writes as empty, like to_csv
+                        result['citation_text'],
+                        result['relationship_text'],
+                        result['total_matches']
+                    )
+                    
+                    # Add citation matches, then relationship matches
+                    for match_type, matches in (('citation', result['citation_matches']),
+                                                ('relationship', result['relationship_matches'])):
+                        for i, match in enumerate(matches):
+                            writer.writerow(base_values + (
+                                match_type, i, match['table_name'], match['column_name'],
+                                match['similarity_score'], match['matched_text']
+                            ))
+                    
+                    # If no matches, add a row with just the base data
+                    if result['total_matches'] == 0:
+                        writer.writerow(base_values + ('none', 0, '', '', 0, ''))
             
-            # Create DataFrame and save to CSV
-            df_results = pd.DataFrame(flattened_results)
-            df_results.to_csv(output_file, index=False)
             logger.info(f"Results saved to {output_file}")
             
         except Exception as e:
@@ -342,7 +591,11 @@ def main():
     output_file_path = 'extraction_results.csv'
     
     # Initialize extractor
-    extractor = DataExtractor(db_config)
+    extractor = DataExtractor(
+        db_config,
+        search_workers=int(os.getenv('SEARCH_WORKERS', '1')),
+        trgm_prefilter=os.getenv('TRGM_PREFILTER', 'false').lower() == 'true'
+    )
     
     try:
         # Connect to database
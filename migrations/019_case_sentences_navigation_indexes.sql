@@ -0,0 +1,39 @@
+-- Migration 019: Navigation index on case_sentences
+-- Supports the per-chunk lookups in app/services/context_navigator.py
+-- (get_word_context_window, get_chunk_with_highlights), which filter on
+--   WHERE cs.chunk_id = :chunk_id AND cs.tsv @@ <tsquery>
+--
+-- The full-text side is already served by the existing GIN index
+-- idx_case_sentences_tsv; a second GIN on tsv would only double the GIN
+-- maintenance on every sentence insert, so none is created here. With the
+-- BTree below the planner can:
+--   * bitmap-AND idx_case_sentences_tsv and this BTree for the filtered path
+--   * use an index-only scan for chunk_id reads of sentence ids/order, which
+--     are carried in the INCLUDE list
+--
+-- The sentence text column is deliberately not INCLUDEd: it would copy every
+-- sentence into the index, and BTree entries are limited to ~2.7 kB, so one
+-- long sentence would make the insert fail.
+
+-- Covering BTree for per-chunk sentence reads
+CREATE INDEX IF NOT EXISTS case_sentences_chunk_id_btree
+    ON public.case_sentences(chunk_id)
+    INCLUDE (sentence_id, sentence_order);
+
+ANALYZE public.case_sentences;
+
+-- Verify the changes
+DO $$
+DECLARE
+    idx_count INTEGER;
+BEGIN
+    SELECT COUNT(*) INTO idx_count
+    FROM pg_indexes
+    WHERE schemaname = 'public'
+    AND tablename = 'case_sentences'
+    AND indexname IN ('idx_case_sentences_tsv', 'case_sentences_chunk_id_btree');
+
+    RAISE NOTICE 'case_sentences navigation indexes present: % (expected: 2)', idx_count;
+END $$;
+
+-- Migration complete
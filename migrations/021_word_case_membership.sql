@@ -0,0 +1,74 @@
+-- Migration 021: word_case membership for incremental document frequency
+-- word_dictionary.df counts the cases a word appears in. Since word_occurrence
+-- was dropped (018) it is maintained incrementally at ingest time:
+--
+--   WITH new_members AS (
+--       INSERT INTO word_case (word_id, case_id) ... ON CONFLICT DO NOTHING
+--       RETURNING word_id
+--   )
+--   UPDATE word_dictionary SET df = df + 1 FROM new_members ...
+--
+-- Only (word, case) pairs seen for the first time bump df, so re-ingesting or
+-- re-processing a case is idempotent, and the cost is O(unique words in the
+-- case) rather than a re-aggregation over the whole corpus.
+--
+-- Idempotency needs word_case to cover every case already counted in df, so
+-- this migration backfills word_case from the stored sentences and resets df
+-- to the backfilled counts (one full pass over case_sentences).
+
+CREATE TABLE IF NOT EXISTS public.word_case (
+    word_id integer NOT NULL REFERENCES public.word_dictionary(word_id) ON DELETE CASCADE,
+    case_id bigint NOT NULL REFERENCES public.cases(case_id) ON DELETE CASCADE,
+    PRIMARY KEY (word_id, case_id)
+);
+
+-- Supports ON DELETE CASCADE from cases
+CREATE INDEX IF NOT EXISTS idx_word_case_case_id
+    ON public.word_case(case_id);
+
+-- Backfill membership for cases ingested before this migration. The words
+-- are re-derived from case_sentences.text with an SQL approximation of the
+-- ingest tokenizer (lower-cased [alnum_'-] runs, edge quotes/hyphens trimmed,
+-- possessive 's removed); only words already in word_dictionary are linked.
+INSERT INTO public.word_case (word_id, case_id)
+SELECT DISTINCT wd.word_id, t.case_id
+FROM (
+    SELECT cs.case_id,
+           regexp_replace(btrim(m[1], '''-'), '''s$', '') AS word
+    FROM public.case_sentences cs,
+         regexp_matches(lower(cs.text), '([[:alnum:]_''-]+)', 'g') AS m
+) t
+JOIN public.word_dictionary wd ON wd.word = t.word
+ON CONFLICT DO NOTHING;
+
+-- df is then recomputed from word_case, so df equals the number of word_case
+-- rows per word before the first incremental update. Old df values (kept
+-- without membership) would otherwise be bumped again on the first re-ingest
+-- of every existing case. Re-running the migration keeps the invariant.
+UPDATE public.word_dictionary wd
+SET df = c.n
+FROM (
+    SELECT d.word_id, COUNT(wc.case_id) AS n
+    FROM public.word_dictionary d
+    LEFT JOIN public.word_case wc ON wc.word_id = d.word_id
+    GROUP BY d.word_id
+) c
+WHERE wd.word_id = c.word_id
+  AND wd.df IS DISTINCT FROM c.n;
+
+ANALYZE public.word_case;
+
+-- Verify the changes
+DO $$
+DECLARE
+    tbl_count INTEGER;
+BEGIN
+    SELECT COUNT(*) INTO tbl_count
+    FROM pg_tables
+    WHERE schemaname = 'public'
+    AND tablename = 'word_case';
+
+    RAISE NOTICE 'word_case table present: % (expected: 1)', tbl_count;
+END $$;
+
+-- Migration complete
@@ -5,13 +5,14 @@ Combines metadata (CSV) + PDF extraction + LLM extraction
 
 import csv
 import logging
-import re
+import os
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Tuple, Callable, Iterator
 from datetime import datetime
+from functools import lru_cache
 from dateutil import parser as date_parser
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import threading
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from itertools import islice
 
 from .models import CaseMetadata, ExtractedCase
 from .pdf_extractor import PDFExtractor
@@ -19,11 +20,8 @@ from .llm_extractor import LLMExtractor
 
 logger = logging.getLogger(__name__)
 
-# Thread-local storage for per-thread extractors
-_thread_local = threading.local()
-
 # Washington State Counties (official list - 39 counties)
-WASHINGTON_COUNTIES = {
+WASHINGTON_COUNTIES = frozenset({
     'adams', 'asotin', 'benton', 'chelan', 'clark', 'clallam', 'columbia',
     'cowlitz', 'douglas', 'ferry', 'franklin', 'garfield', 'grant',
     'grays harbor', 'island', 'jefferson', 'king', 'kitsap', 'kittitas',
@@ -31,42 +29,127 @@ WASHINGTON_COUNTIES = {
     'pend oreille', 'pierce', 'san juan', 'skagit', 'skamania',
     'snohomish', 'spokane', 'stevens', 'thurston', 'wahkiakum',
     'walla walla', 'whatcom', 'whitman', 'yakima'
-}
+})
+
+
+# (name, display name) pairs, longest names first so "walla walla" wins over
+# any shorter county ending the same way; titles are built once, not per match
+_COUNTY_NAMES = tuple(
+    (county, county.title())
+    for county in sorted(WASHINGTON_COUNTIES, key=len, reverse=True)
+)
+
+# County info typically appears in the caption, within the first 15000 chars
+_COUNTY_SEARCH_CHARS = 15000
+
+
+def _is_word_char(ch: str) -> bool:
+    """Same character class as regex \\w."""
+    return ch.isalnum() or ch == '_'
 
 
 def extract_county_from_text(text: str) -> Optional[str]:
     """
-    Extract county name from case text using regex pattern matching.
+    Extract county name from case text.
     Searches against official Washington State counties list.
     
+    Every phrasing the county appears in ("X county superior court", "appeal
+    from X county", "in X county", ...) contains "X county", so the search
+    anchors on the literal "county" (str.find, rare in opinion text) and only
+    then checks whether a county name, preceded by a word boundary, ends just
+    before the whitespace in front of it. Equivalent to matching
+    r'\b(<county>|...)\s+county\b' case-insensitively, without running the
+    alternation at every position.
+    
     Args:
         text: Full case text (not truncated)
         
     Returns:
-        County name (title case) or None
+        County name (title case) of the first county mentioned, or None
     """
-    # Search first 15000 chars where county info typically appears
-    search_text = text[:15000].lower()
+    search_text = text[:_COUNTY_SEARCH_CHARS].lower()
+    text_len = len(search_text)
     
-    # Try each county with various patterns
-    for county in WASHINGTON_COUNTIES:
-        patterns = [
-            rf'\b{county} county superior court\b',
-            rf'\bappeal from {county} county\b',
-            rf'\bfrom {county} county superior court\b',
-            rf'\bin {county} county\b',
-            rf'\bof {county} county\b',
-            rf'\b{county} county\b'
-        ]
-        
-        for pattern in patterns:
-            if re.search(pattern, search_text):
-                # Return proper title case
-                return county.title()
+    pos = search_text.find('county')
+    while pos >= 0:
+        after = pos + 6
+        if after == text_len or not _is_word_char(search_text[after]):
+            # Step back over the whitespace between the name and "county"
+            name_end = pos
+            while name_end > 0 and search_text[name_end - 1].isspace():
+                name_end -= 1
+            if name_end < pos:
+                for county, title in _COUNTY_NAMES:
+                    if search_text.endswith(county, 0, name_end):
+                        name_start = name_end - len(county)
+                        if name_start == 0 or not _is_word_char(search_text[name_start - 1]):
+                            return title
+        pos = search_text.find('county', pos + 1)
     
     return None
 
 
+# ExtractedCase fields taken from the LLM result when merging it into the case
+# built from metadata + PDF text (county is merged separately: the full-text
+# match takes precedence)
+_LLM_CASE_FIELDS = (
+    'summary', 'case_type', 'trial_court', 'trial_judge', 'source_docket_number',
+    'appeal_outcome', 'outcome_detail', 'winner_legal_role', 'winner_personal_role',
+    'parties', 'attorneys', 'judges', 'citations', 'statutes', 'issues',
+    'llm_model', 'extraction_successful', 'error_message',
+)
+
+
+# Known metadata CSV formats, tried before dateutil's heuristics: file_date is
+# written like "Jan. 16, 2025" (no period for May, full month names occur too)
+_FILE_DATE_FORMATS = ('%b. %d, %Y', '%b %d, %Y', '%B %d, %Y')
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(value: str) -> Optional[datetime]:
+    """
+    Parse a metadata date string, memoized: many CSV rows share the same
+    file_date, and dateutil's heuristic parser is slow.
+    
+    ISO timestamps (scraped_at) go through datetime.fromisoformat and the known
+    file_date formats through strptime; dateutil is only the fallback.
+    Returns None (also cached) when the string can't be parsed.
+    """
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    for fmt in _FILE_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            pass
+    try:
+        return date_parser.parse(value)
+    except (ValueError, OverflowError):
+        return None
+
+
+def iter_pdf_files(root: Path) -> Iterator[Path]:
+    """
+    Lazily yield every *.pdf under root (recursive), like Path.rglob("*.pdf")
+    but without building the whole list first, so a limit can stop the walk
+    early. Directory symlinks are not followed, matching rglob.
+    """
+    try:
+        with os.scandir(root) as entries:
+            subdirs = []
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.name.endswith('.pdf'):
+                    yield Path(entry.path)
+    except PermissionError:
+        return
+    for subdir in subdirs:
+        yield from iter_pdf_files(subdir)
+
+
 class CaseProcessor:
     """
     Main processor that orchestrates the full extraction pipeline.
@@ -82,7 +165,8 @@ class CaseProcessor:
         self,
         pdf_extractor: Optional[PDFExtractor] = None,
         llm_extractor: Optional[LLMExtractor] = None,
-        max_workers: int = 4
+        max_workers: int = 4,
+        pdf_workers: Optional[int] = None
     ):
         """
         Initialize the case processor.
@@ -91,10 +175,14 @@ class CaseProcessor:
             pdf_extractor: PDFExtractor instance (created if not provided)
             llm_extractor: LLMExtractor instance (created if not provided)
             max_workers: Number of parallel workers for batch processing
+                         (concurrent LLM extractions in parallel mode)
+            pdf_workers: Concurrent PDF extractions in parallel mode
+                         (default: max_workers)
         """
         self.pdf_extractor = pdf_extractor or PDFExtractor()
         self.llm_extractor = llm_extractor or LLMExtractor()
         self.max_workers = max_workers
+        self.pdf_workers = pdf_workers or max_workers
     
     def load_metadata_csv(self, csv_path: str) -> Dict[str, Dict[str, Any]]:
         """
@@ -108,7 +196,9 @@ class CaseProcessor:
         """
         metadata_map = {}
         
-        with open(csv_path, 'r', encoding='utf-8') as f:
+        # Read sequentially through a 1 MB buffer; newline='' lets the csv
+        # module handle newlines embedded in quoted fields (e.g. case titles)
+        with open(csv_path, 'r', encoding='utf-8', newline='', buffering=1 << 20) as f:
             reader = csv.DictReader(f)
             for row in reader:
                 case_number = row.get('case_number', '').strip()
@@ -154,19 +244,16 @@ class CaseProcessor:
         # Parse file_date (e.g., "Jan. 16, 2025")
         file_date_str = row.get('file_date', '').strip()
         if file_date_str:
-            try:
-                parsed = date_parser.parse(file_date_str)
+            parsed = _parse_date(file_date_str)
+            if parsed:
                 metadata.file_date = parsed.date()
-            except:
-                pass
         
         # Parse scraped_at timestamp
         scraped_at_str = row.get('scraped_at', '').strip()
         if scraped_at_str:
-            try:
-                metadata.scraped_at = date_parser.parse(scraped_at_str)
-            except:
-                pass
+            parsed = _parse_date(scraped_at_str)
+            if parsed:
+                metadata.scraped_at = parsed
         
         # Derive court_level from opinion_type (keep human-readable)
         opinion_type_lower = metadata.opinion_type.lower()
@@ -194,8 +281,25 @@ class CaseProcessor:
         Returns:
             ExtractedCase with all extracted data
         """
+        case, extracted_county, ok = self._extract_pdf_stage(pdf_path, metadata_row)
+        if not ok:
+            return case
+        return self._extract_llm_stage(case, extracted_county)
+    
+    def _extract_pdf_stage(
+        self,
+        pdf_path: str,
+        metadata_row: Optional[Dict[str, Any]] = None
+    ) -> Tuple[ExtractedCase, Optional[str], bool]:
+        """
+        First half of process_case: metadata, PDF text and county (steps 1-2.5).
+        
+        Returns:
+            (case, pre-extracted county, ok); when ok is False the case is
+            already marked failed and must not go to the LLM stage
+        """
         pdf_path = Path(pdf_path)
-        logger.info(f"Processing case: {pdf_path.name}")
+        logger.info("Processing case: %s", pdf_path.name)
         
         # Initialize result
         case = ExtractedCase()
@@ -210,7 +314,7 @@ class CaseProcessor:
                 # Ensure pdf_filename is set even if CSV doesn't have it
                 if not case.metadata.pdf_filename:
                     case.metadata.pdf_filename = pdf_path.name
-                logger.info(f"  Metadata: {case.metadata.case_number} - {case.metadata.case_title}")
+                logger.info("  Metadata: %s - %s", case.metadata.case_number, case.metadata.case_title)
             else:
                 # No CSV metadata - try to extract basic info from filename
                 # Format: "39300-3_III.pdf" -> case_number="39300-3", division="III"
@@ -221,14 +325,14 @@ class CaseProcessor:
                     case.metadata.division = parts[1] if len(parts) > 1 else ""
                 else:
                     case.metadata.case_number = stem
-                logger.warning(f"  No CSV metadata found for {pdf_path.name} - using filename info")
+                logger.warning("  No CSV metadata found for %s - using filename info", pdf_path.name)
             
             # Step 2: Extract text from PDF
             logger.info("  Extracting PDF text...")
             full_text, page_count = self.pdf_extractor.extract_text(str(pdf_path))
             case.full_text = full_text
             case.page_count = page_count
-            logger.info(f"  Extracted {len(full_text)} chars from {page_count} pages")
+            logger.info("  Extracted %d chars from %d pages", len(full_text), page_count)
             
             if not full_text or len(full_text.strip()) < 100:
                 raise ValueError("PDF text extraction returned insufficient content")
@@ -236,49 +340,45 @@ class CaseProcessor:
             # Step 2.5: Extract county from full text (before LLM truncation)
             extracted_county = extract_county_from_text(full_text)
             if extracted_county:
-                logger.info(f"  Pre-extracted county: {extracted_county}")
+                logger.info("  Pre-extracted county: %s", extracted_county)
+            
+            return case, extracted_county, True
             
+        except Exception as e:
+            return self._mark_failed(case, e), None, False
+    
+    def _extract_llm_stage(self, case: ExtractedCase, extracted_county: Optional[str]) -> ExtractedCase:
+        """Second half of process_case: LLM extraction and merge (steps 3-4)."""
+        try:
             # Step 3: Extract structured data using LLM
             logger.info("  Running LLM extraction...")
-            llm_result = self.llm_extractor.extract(full_text)
+            llm_result = self.llm_extractor.extract(case.full_text)
             
             # Step 4: Build case from LLM result
             llm_case = self.llm_extractor.build_extracted_case(llm_result)
             
             # Merge LLM extraction into our case
-            case.summary = llm_case.summary
-            case.case_type = llm_case.case_type
+            for name in _LLM_CASE_FIELDS:
+                setattr(case, name, getattr(llm_case, name))
             # Use pre-extracted county (from full text) if available, otherwise LLM result
             case.county = extracted_county or llm_case.county
-            case.trial_court = llm_case.trial_court
-            case.trial_judge = llm_case.trial_judge
-            case.source_docket_number = llm_case.source_docket_number
-            case.appeal_outcome = llm_case.appeal_outcome
-            case.outcome_detail = llm_case.outcome_detail
-            case.winner_legal_role = llm_case.winner_legal_role
-            case.winner_personal_role = llm_case.winner_personal_role
-            case.parties = llm_case.parties
-            case.attorneys = llm_case.attorneys
-            case.judges = llm_case.judges
-            case.citations = llm_case.citations
-            case.statutes = llm_case.statutes
-            case.issues = llm_case.issues
             case.extraction_timestamp = datetime.now()
-            case.llm_model = llm_case.llm_model
-            case.extraction_successful = llm_case.extraction_successful
-            case.error_message = llm_case.error_message
             
-            logger.info(f"  Extraction complete: {len(case.parties)} parties, "
-                       f"{len(case.judges)} judges, {len(case.issues)} issues")
+            logger.info("  Extraction complete: %d parties, %d judges, %d issues",
+                        len(case.parties), len(case.judges), len(case.issues))
             
             return case
             
         except Exception as e:
-            logger.error(f"  Processing failed: {e}")
-            case.extraction_successful = False
-            case.error_message = str(e)
-            case.extraction_timestamp = datetime.now()
-            return case
+            return self._mark_failed(case, e)
+    
+    def _mark_failed(self, case: ExtractedCase, error: Exception) -> ExtractedCase:
+        """Record a processing failure on the case."""
+        logger.error("  Processing failed: %s", error)
+        case.extraction_successful = False
+        case.error_message = str(error)
+        case.extraction_timestamp = datetime.now()
+        return case
     
     def process_batch(
         self,
@@ -286,7 +386,8 @@ class CaseProcessor:
         metadata_csv: Optional[str] = None,
         limit: Optional[int] = None,
         parallel: bool = True,
-        pdf_files: Optional[List[str]] = None
+        pdf_files: Optional[List[str]] = None,
+        on_result: Optional[Callable[[ExtractedCase], None]] = None
     ) -> List[ExtractedCase]:
         """
         Process a batch of PDF files (with optional parallel processing).
@@ -297,6 +398,8 @@ class CaseProcessor:
             limit: Maximum number of files to process
             parallel: Use parallel processing (default True)
             pdf_files: Specific list of PDF file paths to process (overrides pdf_dir scan)
+            on_result: Called with each case as soon as it finishes (completion
+                       order), so callers can ingest while the batch is running
             
         Returns:
             List of ExtractedCase objects
@@ -311,102 +414,142 @@ class CaseProcessor:
         # Use provided pdf_files list or scan directory
         if pdf_files:
             pdf_file_paths = [Path(f) for f in pdf_files]
+            if limit:
+                pdf_file_paths = pdf_file_paths[:limit]
         else:
-            # Find all PDFs (recursively)
-            pdf_file_paths = list(pdf_dir.rglob("*.pdf"))
-        
-        if limit:
-            pdf_file_paths = pdf_file_paths[:limit]
+            # Find all PDFs (recursively), stopping the walk once limit is reached
+            pdf_file_paths = list(islice(iter_pdf_files(pdf_dir), limit or None))
         
         logger.info(f"Processing {len(pdf_file_paths)} PDF files from {pdf_dir}")
         
+        # Index metadata by pdf_filename so each PDF is a dict probe (metadata_map
+        # is already keyed by case_number) instead of a scan of every row
+        by_filename = {
+            row['pdf_filename'].strip(): row
+            for row in metadata_map.values() if row.get('pdf_filename', '').strip()
+        }
+        
         # Build list of (pdf_path, metadata_row) tuples
         tasks: List[Tuple[Path, Optional[Dict]]] = []
         for pdf_path in pdf_file_paths:
             metadata_row = None
             if metadata_map:
-                for case_num, row in metadata_map.items():
-                    if case_num in pdf_path.name or row.get('pdf_filename', '') == pdf_path.name:
-                        metadata_row = row
-                        break
+                # Filenames look like "39300-3_III.pdf" -> case_number "39300-3"
+                metadata_row = (by_filename.get(pdf_path.name)
+                                or metadata_map.get(pdf_path.stem.rsplit('_', 1)[0]))
+                if metadata_row is None:
+                    # Unusual filenames: fall back to the substring scan
+                    for case_num, row in metadata_map.items():
+                        if case_num in pdf_path.name or row.get('pdf_filename', '') == pdf_path.name:
+                            metadata_row = row
+                            break
             tasks.append((pdf_path, metadata_row))
         
         if parallel and len(tasks) > 1:
-            return self._process_batch_parallel(tasks)
+            return self._process_batch_parallel(tasks, on_result)
         else:
-            return self._process_batch_sequential(tasks)
+            return self._process_batch_sequential(tasks, on_result)
     
-    def _process_batch_sequential(self, tasks: List[Tuple[Path, Optional[Dict]]]) -> List[ExtractedCase]:
+    def _process_batch_sequential(
+        self,
+        tasks: List[Tuple[Path, Optional[Dict]]],
+        on_result: Optional[Callable[[ExtractedCase], None]] = None
+    ) -> List[ExtractedCase]:
         """Process tasks sequentially."""
         results = []
         total = len(tasks)
         
         for i, (pdf_path, metadata_row) in enumerate(tasks, 1):
-            logger.info(f"\n[{i}/{total}] Processing: {pdf_path.name}")
+            logger.info("\n[%d/%d] Processing: %s", i, total, pdf_path.name)
             case = self.process_case(str(pdf_path), metadata_row)
             results.append(case)
             
             if case.extraction_successful:
-                logger.info(f"  [OK] Success")
+                logger.info("  [OK] Success")
             else:
-                logger.warning(f"  [FAIL] {case.error_message}")
+                logger.warning("  [FAIL] %s", case.error_message)
+            
+            if on_result:
+                on_result(case)
         
         successful = sum(1 for c in results if c.extraction_successful)
         logger.info(f"\nBatch complete: {successful}/{len(results)} successful")
         return results
     
-    def _process_batch_parallel(self, tasks: List[Tuple[Path, Optional[Dict]]]) -> List[ExtractedCase]:
-        """Process tasks in parallel using ThreadPoolExecutor."""
-        results = []
-        total = len(tasks)
-        counter = {'completed': 0}  # Use dict for mutable counter
-        lock = threading.Lock()
+    def _process_batch_parallel(
+        self,
+        tasks: List[Tuple[Path, Optional[Dict]]],
+        on_result: Optional[Callable[[ExtractedCase], None]] = None
+    ) -> List[ExtractedCase]:
+        """
+        Process tasks in parallel as a two-stage pipeline.
         
-        logger.info(f"Using {self.max_workers} parallel workers")
+        PDF extraction and LLM extraction run in separate thread pools, so PDF
+        workers keep preparing the next cases while the LLM workers are busy
+        (and vice versa) instead of each worker idling on one stage. At most
+        pdf_workers + 2 * max_workers cases are in flight at once, which bounds
+        how much extracted text waits in memory for the LLM.
         
-        def process_task(task_info: Tuple[int, Path, Optional[Dict]]) -> Tuple[int, ExtractedCase]:
-            """Worker function to process a single case."""
-            idx, pdf_path, metadata_row = task_info
-            case = self.process_case(str(pdf_path), metadata_row)
-            return (idx, case)
+        on_result (if given) receives each case from this thread as soon as it
+        finishes; the returned list is still in task order.
+        """
+        total = len(tasks)
+        results: List[Optional[ExtractedCase]] = [None] * total
+        max_in_flight = self.pdf_workers + 2 * self.max_workers
         
-        # Create indexed tasks
-        indexed_tasks = [(i, pdf_path, metadata_row) for i, (pdf_path, metadata_row) in enumerate(tasks)]
+        logger.info(f"Using {self.pdf_workers} PDF workers and {self.max_workers} LLM workers")
         
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all tasks
-            futures = {executor.submit(process_task, task): task for task in indexed_tasks}
+        with ThreadPoolExecutor(max_workers=self.pdf_workers) as pdf_pool, \
+                ThreadPoolExecutor(max_workers=self.max_workers) as llm_pool:
+            
+            # future -> (task index, stage)
+            futures: Dict[Future, Tuple[int, str]] = {}
+            next_task = 0
+            completed = 0
             
-            # Collect results as they complete
-            for future in as_completed(futures):
-                task = futures[future]
-                idx, pdf_path, _ = task
+            while completed < total:
+                # Start PDF extraction for more tasks while under the in-flight cap
+                while next_task < total and len(futures) < max_in_flight:
+                    pdf_path, metadata_row = tasks[next_task]
+                    future = pdf_pool.submit(self._extract_pdf_stage, str(pdf_path), metadata_row)
+                    futures[future] = (next_task, 'pdf')
+                    next_task += 1
                 
-                try:
-                    result_idx, case = future.result()
-                    results.append((result_idx, case))
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    idx, stage = futures.pop(future)
+                    pdf_path = tasks[idx][0]
                     
-                    with lock:
-                        counter['completed'] += 1
+                    try:
+                        if stage == 'pdf':
+                            case, extracted_county, ok = future.result()
+                            if ok:
+                                # Hand the extracted text to the LLM stage
+                                llm_future = llm_pool.submit(self._extract_llm_stage, case, extracted_county)
+                                futures[llm_future] = (idx, 'llm')
+                                continue
+                        else:
+                            case = future.result()
+                        
+                        completed += 1
                         status = "[OK]" if case.extraction_successful else "[FAIL]"
-                        logger.info(f"[{counter['completed']}/{total}] {status} {pdf_path.name}")
+                        logger.info("[%d/%d] %s %s", completed, total, status, pdf_path.name)
                         
-                except Exception as e:
-                    with lock:
-                        counter['completed'] += 1
-                        logger.error(f"[{counter['completed']}/{total}] [ERROR] {pdf_path.name}: {e}")
+                    except Exception as e:
+                        completed += 1
+                        logger.error("[%d/%d] [ERROR] %s: %s", completed, total, pdf_path.name, e)
+                        
+                        # Create failed case
+                        case = ExtractedCase()
+                        case.extraction_successful = False
+                        case.error_message = str(e)
                     
-                    # Create failed case
-                    case = ExtractedCase()
-                    case.extraction_successful = False
-                    case.error_message = str(e)
-                    results.append((idx, case))
-        
-        # Sort by original order and extract cases
-        results.sort(key=lambda x: x[0])
-        ordered_cases = [case for _, case in results]
+                    results[idx] = case
+                    if on_result:
+                        on_result(case)
         
-        successful = sum(1 for c in ordered_cases if c.extraction_successful)
-        logger.info(f"\nBatch complete: {successful}/{len(ordered_cases)} successful")
+        successful = sum(1 for c in results if c.extraction_successful)
+        logger.info(f"\nBatch complete: {successful}/{len(results)} successful")
         
-        return ordered_cases
+        return results
@@ -81,6 +81,14 @@ class LegalTextChunker:
             r"ORDER"
         ]
     }
+    # Each section's patterns compiled once as a single alternation, in the same
+    # section order, so a header check is one search per section
+    SECTION_RES = [
+        (section_name, re.compile('|'.join(f'(?:{p})' for p in patterns)))
+        for section_name, patterns in SECTION_PATTERNS.items()
+    ]
+    PARAGRAPH_BREAK_RE = re.compile(r'\n\s*\n')
+    WHITESPACE_RE = re.compile(r'\s+')
     
     def __init__(
         self,
@@ -141,14 +149,14 @@ class LegalTextChunker:
     def _split_into_paragraphs(self, text: str) -> List[str]:
         """Split text into paragraphs."""
         # Split on double line breaks or more
-        paragraphs = re.split(r'\n\s*\n', text)
+        paragraphs = self.PARAGRAPH_BREAK_RE.split(text)
         
         # Clean and filter empty paragraphs
         cleaned = []
         for para in paragraphs:
             para = para.strip()
             # Normalize whitespace
-            para = re.sub(r'\s+', ' ', para)
+            para = self.WHITESPACE_RE.sub(' ', para)
             if para and len(para.split()) >= 5:  # At least 5 words
                 cleaned.append(para)
         
@@ -176,10 +184,9 @@ class LegalTextChunker:
         """Detect if paragraph is a section header."""
         para_upper = paragraph.upper()
         
-        for section_name, patterns in self.SECTION_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, para_upper):
-                    return section_name
+        for section_name, section_re in self.SECTION_RES:
+            if section_re.search(para_upper):
+                return section_name
         
         return None
     
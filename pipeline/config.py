@@ -30,6 +30,10 @@ class PipelineConfig:
     max_text_chars: int = 25000      # Max chars to send to LLM (optimized)
     llm_timeout: int = 180           # LLM request timeout in seconds (optimized)
     
+    # Content-addressed caches so re-runs over the same PDFs skip the LLM call
+    cache_enabled: bool = True
+    cache_dir: str = ".cache/pipeline"
+    
     @classmethod
     def from_env(cls) -> 'PipelineConfig':
         """Load configuration from environment variables."""
@@ -44,8 +48,16 @@ class PipelineConfig:
             ollama_embedding_model=os.getenv("OLLAMA_EMBEDDING_MODEL", "mxbai-embed-large"),
             max_text_chars=int(os.getenv("MAX_TEXT_CHARS", "30000")),
             llm_timeout=int(os.getenv("LLM_TIMEOUT", "300")),
+            cache_enabled=os.getenv("PIPELINE_CACHE", "true").lower() == "true",
+            cache_dir=os.getenv("PIPELINE_CACHE_DIR", ".cache/pipeline"),
         )
     
+    def get_cache_dir(self, name: str) -> Optional[str]:
+        """Directory for one cache (e.g. 'llm'), or None when caching is disabled."""
+        if not self.cache_enabled:
+            return None
+        return os.path.join(self.cache_dir, name)
+    
     def validate(self) -> bool:
         """Validate that required settings are present."""
         if not self.database_url:
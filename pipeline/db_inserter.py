@@ -119,6 +119,7 @@ class DatabaseInserter:
         self.enable_rag = enable_rag
         self._dimension_service = None
         self._rag_processor = None
+        self._redis_client = None
     
     @classmethod
     def from_url(cls, database_url: str, enable_rag: bool = True) -> 'DatabaseInserter':
@@ -275,6 +276,10 @@ class DatabaseInserter:
                     if self.enable_rag and case.full_text:
                         self._run_rag_processing(case_id, case, clear_existing=not was_inserted, document_id=document_id)
                     
+                    # An updated duplicate rewrote rows the API may have cached
+                    if not was_inserted:
+                        self._invalidate_navigation_cache(case_id)
+                    
                     # Return -1 for duplicates (updated), positive case_id for new inserts
                     return case_id if was_inserted else -1
                     
@@ -307,6 +312,28 @@ class DatabaseInserter:
             except Exception as e:
                 logger.warning(f"Could not clear {table} for case {case_id}: {e}")
     
+    def _invalidate_navigation_cache(self, case_id: int):
+        """
+        Drop the API's cached navigation results for a rewritten case.
+        
+        Only runs when REDIS_URL is set; without it (or without the redis
+        package) the API cache TTL is the only bound on stale entries.
+        """
+        redis_url = os.getenv("REDIS_URL")
+        if not redis_url:
+            return
+        try:
+            import redis
+            from app.services.context_navigator import invalidate_navigation_cache
+            
+            if self._redis_client is None:
+                self._redis_client = redis.Redis.from_url(redis_url)
+            removed = invalidate_navigation_cache(self._redis_client, case_id)
+            if removed:
+                logger.info(f"Invalidated {removed} navigation cache entries for case {case_id}")
+        except Exception as e:
+            logger.warning(f"Navigation cache invalidation failed for case {case_id}: {e}")
+    
     def _insert_document(self, conn, case_id: int, case: ExtractedCase) -> Optional[int]:
         """
         Insert a document record for the source PDF.
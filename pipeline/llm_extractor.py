@@ -5,8 +5,12 @@ Extracts structured legal case data from PDF text using local LLM.
 
 import os
 import json
+import hashlib
 import logging
-from typing import Optional, Dict, Any, List
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
 
 from .models import (
@@ -148,11 +152,19 @@ class LLMExtractor:
     Extract structured legal case data using Ollama LLM.
     """
     
+    # Generation options sent with every request; part of the cache key
+    OLLAMA_OPTIONS = {
+        "temperature": 0.1,      # Low temperature for consistent extraction
+        "num_predict": 8192,     # Reduced from 16384 - sufficient for case JSON
+        "num_ctx": 32768,        # Reduced from 128k to 32k - saves memory/time
+    }
+    
     def __init__(
         self,
         model: str = None,
         base_url: str = None,
-        timeout: int = 300
+        timeout: int = 300,
+        cache_dir: Optional[str] = None
     ):
         """
         Initialize the LLM extractor.
@@ -161,10 +173,17 @@ class LLMExtractor:
             model: Ollama model name (default: from OLLAMA_MODEL env or 'llama3.2:3b')
             base_url: Ollama server URL (default: from OLLAMA_BASE_URL env or 'http://localhost:11434')
             timeout: Request timeout in seconds
+            cache_dir: Directory for cached extraction results (None disables caching)
         """
         self.model = model or os.getenv("OLLAMA_MODEL", "llama3.2:3b")
         self.base_url = base_url or os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
         self.timeout = timeout
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # One requests.Session per worker thread (Session is not thread-safe),
+        # so each thread keeps its Ollama connection alive between cases
+        self._thread_local = threading.local()
         
         logger.info(f"LLM Extractor initialized with model: {self.model}")
     
@@ -203,12 +222,23 @@ class LLMExtractor:
         # Build the prompt
         prompt = EXTRACTION_PROMPT.format(text=text)
         
+        cache_key = self._cache_key(prompt) if self.cache_dir else None
+        if cache_key:
+            cached = self._load_cached(cache_key)
+            if cached is not None:
+                logger.info(f"Using cached LLM extraction ({cache_key})")
+                return cached
+        
         try:
             # Call Ollama
             response = self._call_ollama(prompt)
             
             # Parse JSON response
-            extracted = self._parse_json_response(response)
+            extracted, parsed_cleanly = self._parse_json_response(response)
+            
+            # Repaired/salvaged or empty results are not cached, so a later run retries them
+            if cache_key and parsed_cleanly and extracted:
+                self._store_cached(cache_key, extracted)
             
             return extracted
             
@@ -216,6 +246,48 @@ class LLMExtractor:
             logger.error(f"LLM extraction failed: {e}")
             return {"error": str(e)}
     
+    def _cache_key(self, prompt: str) -> str:
+        """
+        Content hash of everything that determines the model output: model name,
+        generation options, system prompt and the full (truncated) extraction
+        prompt, which embeds the case text. Changing any of them misses the cache.
+        """
+        options = json.dumps(self.OLLAMA_OPTIONS, sort_keys=True)
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (self.model, options, SYSTEM_PROMPT, prompt):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+    
+    def _load_cached(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached extraction result, or None if absent/unreadable."""
+        try:
+            with open(self.cache_dir / f"{cache_key}.json", 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable LLM cache entry {cache_key}: {e}")
+            return None
+    
+    def _store_cached(self, cache_key: str, extracted: Dict[str, Any]) -> None:
+        """Write a result atomically (temp file + rename) so parallel workers never read partial JSON."""
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(extracted, f)
+            os.replace(tmp_path, self.cache_dir / f"{cache_key}.json")
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to cache LLM extraction {cache_key}: {e}")
+    
+    def _session(self):
+        """This thread's requests.Session, created on first use."""
+        session = getattr(self._thread_local, 'session', None)
+        if session is None:
+            import requests
+            session = self._thread_local.session = requests.Session()
+        return session
+    
     def _call_ollama(self, prompt: str) -> str:
         """
         Make a request to Ollama API.
@@ -226,8 +298,6 @@ class LLMExtractor:
         Returns:
             Response text from the model
         """
-        import requests
-        
         url = f"{self.base_url}/api/generate"
         
         payload = {
@@ -235,16 +305,12 @@ class LLMExtractor:
             "prompt": prompt,
             "system": SYSTEM_PROMPT,
             "stream": False,
-            "options": {
-                "temperature": 0.1,      # Low temperature for consistent extraction
-                "num_predict": 8192,     # Reduced from 16384 - sufficient for case JSON
-                "num_ctx": 32768,        # Reduced from 128k to 32k - saves memory/time
-            }
+            "options": self.OLLAMA_OPTIONS,
         }
         
         logger.info(f"Calling Ollama ({self.model})...")
         
-        response = requests.post(
+        response = self._session().post(
             url,
             json=payload,
             timeout=self.timeout
@@ -279,7 +345,7 @@ class LLMExtractor:
         except Exception:
             return None
     
-    def _parse_json_response(self, response: str) -> Dict[str, Any]:
+    def _parse_json_response(self, response: str) -> Tuple[Dict[str, Any], bool]:
         """
         Parse JSON from LLM response, handling common issues.
         
@@ -287,7 +353,7 @@ class LLMExtractor:
             response: Raw response from LLM
             
         Returns:
-            Parsed dictionary
+            Tuple of (parsed dictionary, True if the JSON parsed without repairs)
         """
         # Clean up response
         text = response.strip()
@@ -311,21 +377,21 @@ class LLMExtractor:
         
         if start == -1:
             logger.warning(f"No JSON object found in response. Response preview: {text[:300]}...")
-            return {}
+            return {}, False
         
         # Check if JSON was truncated (no closing brace)
         if end == 0:
             logger.warning(f"JSON response appears truncated (no closing brace). Attempting regex extraction...")
-            return self._fix_and_parse_json(text[start:])
+            return self._fix_and_parse_json(text[start:]), False
         
         json_str = text[start:end]
         
         try:
-            return json.loads(json_str)
+            return json.loads(json_str), True
         except json.JSONDecodeError as e:
             logger.warning(f"JSON parse error: {e}")
             # Try to fix common issues
-            return self._fix_and_parse_json(json_str)
+            return self._fix_and_parse_json(json_str), False
     
     def _fix_and_parse_json(self, json_str: str) -> Dict[str, Any]:
         """
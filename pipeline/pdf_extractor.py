@@ -4,17 +4,39 @@ Production-grade PDF OCR and text extraction for legal documents.
 """
 
 import os
+import json
+import hashlib
 import logging
+import tempfile
 import time
 import threading
 import re
+from functools import lru_cache
+from importlib import metadata as importlib_metadata
 from typing import Optional, Tuple
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
-# Semaphore to limit concurrent LlamaParse API calls
-_llamaparse_semaphore = threading.Semaphore(2)  # Max 2 concurrent calls
+# Semaphore to limit concurrent LlamaParse API calls (default 2; raise it to
+# let more batch workers wait on LlamaParse at once if the account allows it)
+_llamaparse_semaphore = threading.Semaphore(int(os.getenv("LLAMAPARSE_MAX_CONCURRENCY", "2")))
+
+# Part of the extraction cache key; bump when the text cleanup below changes
+# (clean_cid_characters, slip opinion handling) so stale entries are not reused
+_CACHE_FORMAT_VERSION = 1
+
+# Extraction method -> distribution whose version is part of the cache key
+_EXTRACTOR_PACKAGES = {"llamaparse": "llama-parse", "pdfplumber": "pdfplumber"}
+
+
+@lru_cache(maxsize=None)
+def _package_version(name: str) -> str:
+    """Installed version of a distribution ('unknown' if not installed)."""
+    try:
+        return importlib_metadata.version(name)
+    except importlib_metadata.PackageNotFoundError:
+        return "unknown"
 
 
 def clean_cid_characters(text: str) -> str:
@@ -45,7 +67,12 @@ class PDFExtractor:
     Extract text from PDF files using LlamaParse or pdfplumber.
     """
     
-    def __init__(self, llama_cloud_api_key: Optional[str] = None, mode: str = "llamaparse"):
+    def __init__(
+        self,
+        llama_cloud_api_key: Optional[str] = None,
+        mode: str = "llamaparse",
+        cache_dir: Optional[str] = None
+    ):
         """
         Initialize the PDF extractor.
         
@@ -53,11 +80,15 @@ class PDFExtractor:
             llama_cloud_api_key: API key for LlamaParse. 
                                  If not provided, reads from LLAMA_CLOUD_API_KEY env var.
             mode: Extraction mode - 'llamaparse', 'pdfplumber', or 'auto' (try llamaparse, fallback to pdfplumber)
+            cache_dir: Directory for cached extracted text, keyed by PDF content (None disables caching)
         """
         self.api_key = llama_cloud_api_key or os.getenv("LLAMA_CLOUD_API_KEY")
         self._llama_parser = None
         self._llamaparse_available = False
         self.mode = mode.lower()
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
         
         # Try to initialize LlamaParse if needed
         if self.mode in ("llamaparse", "auto") and self.api_key:
@@ -110,10 +141,56 @@ class PDFExtractor:
         if not pdf_path.exists():
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
         
-        if self._should_use_llamaparse():
-            return self._extract_with_llamaparse(pdf_path)
-        else:
-            return self._extract_with_pdfplumber(pdf_path)
+        use_llamaparse = self._should_use_llamaparse()
+        
+        cache_key = None
+        if self.cache_dir:
+            cache_key = self._cache_key(pdf_path, "llamaparse" if use_llamaparse else "pdfplumber")
+            cached = self._load_cached(cache_key)
+            if cached is not None:
+                logger.info(f"Using cached text for {pdf_path.name} ({cache_key})")
+                return cached
+        
+        if use_llamaparse:
+            # Caches only genuine LlamaParse output, not its pdfplumber fallback
+            return self._extract_with_llamaparse(pdf_path, cache_key)
+        
+        full_text, page_count = self._extract_with_pdfplumber(pdf_path)
+        if cache_key:
+            self._store_cached(cache_key, full_text, page_count)
+        return full_text, page_count
+    
+    def _cache_key(self, pdf_path: Path, method: str) -> str:
+        """blake2b-128 of the PDF bytes plus extraction method and library version."""
+        digest = hashlib.blake2b(digest_size=16)
+        with open(pdf_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        digest.update(f"\0{method}\0{_package_version(_EXTRACTOR_PACKAGES[method])}"
+                      f"\0{_CACHE_FORMAT_VERSION}".encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _load_cached(self, cache_key: str) -> Optional[Tuple[str, int]]:
+        """Return cached (text, page_count), or None if absent/unreadable."""
+        try:
+            with open(self.cache_dir / f"{cache_key}.json", 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            return entry["text"], entry["page_count"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable PDF cache entry {cache_key}: {e}")
+            return None
+    
+    def _store_cached(self, cache_key: str, full_text: str, page_count: int) -> None:
+        """Write an entry atomically (temp file + rename) so parallel workers never read partial JSON."""
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"text": full_text, "page_count": page_count}, f)
+            os.replace(tmp_path, self.cache_dir / f"{cache_key}.json")
+        except OSError as e:
+            logger.warning(f"Failed to cache extracted text {cache_key}: {e}")
     
     def extract_text_from_bytes(self, pdf_content: bytes, filename: str = "document.pdf") -> Tuple[str, int]:
         """
@@ -142,7 +219,7 @@ class PDFExtractor:
             except:
                 pass
     
-    def _extract_with_llamaparse(self, pdf_path: Path) -> Tuple[str, int]:
+    def _extract_with_llamaparse(self, pdf_path: Path, cache_key: Optional[str] = None) -> Tuple[str, int]:
         """
         Extract text using LlamaParse (cloud-based, high quality).
         Uses semaphore to limit concurrent API calls and retries on failure.
@@ -150,6 +227,7 @@ class PDFExtractor:
         
         Args:
             pdf_path: Path to PDF file
+            cache_key: If given, a successful LlamaParse result is cached under it
             
         Returns:
             Tuple of (extracted_text, page_count)
@@ -190,6 +268,8 @@ class PDFExtractor:
                             return self._extract_with_pdfplumber(pdf_path)
                     
                     logger.info(f"LlamaParse extracted {len(full_text)} chars from {page_count} pages")
+                    if cache_key:
+                        self._store_cached(cache_key, full_text, page_count)
                     return full_text, page_count
                 
             except Exception as e:
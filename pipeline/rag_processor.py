@@ -151,6 +151,7 @@ class RAGProcessor:
             
             # Step 4: Process sentences for each chunk
             global_sentence_order = 0
+            case_sentences = []
             for chunk, chunk_id in zip(chunks, chunk_ids):
                 try:
                     sentence_results = self.sentence_processor.process_chunk_sentences(
@@ -161,18 +162,19 @@ class RAGProcessor:
                     sentence_ids = [s['id'] for s in sentence_results]
                     sentences_created += len(sentence_ids)
                     global_sentence_order += len(sentence_ids)
-                    
-                    # Step 5: Process words for each sentence
-                    for sentence_result in sentence_results:
-                        word_count = self.word_processor.process_sentence_words_simple(
-                            sentence_result['id'], sentence_result['text']
-                        )
-                        words_indexed += word_count
+                    case_sentences.extend(sentence_results)
                         
                 except Exception as e:
                     logger.error(f"Error processing chunk {chunk_id}: {e}")
                     errors.append(f"Chunk {chunk_id}: {str(e)}")
             
+            # Step 5: Process words for all of the case's sentences in one transaction
+            try:
+                words_indexed = self.word_processor.process_sentences_bulk(case_id, case_sentences)
+            except Exception as e:
+                logger.error(f"Error processing words for case {case_id}: {e}")
+                errors.append(f"Words: {str(e)}")
+            
             # Flush any remaining word occurrences
             self.word_processor.flush()
             
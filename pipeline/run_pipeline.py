@@ -31,8 +31,8 @@ from typing import Optional
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from pipeline.config import Config
-from pipeline.case_processor import CaseProcessor
+from pipeline.config import Config, PipelineConfig
+from pipeline.case_processor import CaseProcessor, iter_pdf_files
 from pipeline.db_inserter import DatabaseInserter
 from pipeline.progress_tracker import ProgressTracker, load_failed_files_csv
 
@@ -127,12 +127,16 @@ def process_batch(args):
     max_workers = 1 if args.sequential else args.workers
     parallel = not args.sequential and args.workers > 1
     
-    # Create PDF extractor with specified mode
+    # Extractors with the on-disk result caches (PIPELINE_CACHE / PIPELINE_CACHE_DIR)
+    pipeline_config = PipelineConfig.from_env()
     from .pdf_extractor import PDFExtractor
-    pdf_extractor = PDFExtractor(mode=args.pdf_extractor)
+    pdf_extractor = PDFExtractor(mode=args.pdf_extractor, cache_dir=pipeline_config.get_cache_dir("pdf"))
+    from .llm_extractor import LLMExtractor
+    llm_extractor = LLMExtractor(cache_dir=pipeline_config.get_cache_dir("llm"))
     
     processor = CaseProcessor(
         pdf_extractor=pdf_extractor,
+        llm_extractor=llm_extractor,
         max_workers=max_workers
     )
     
@@ -146,8 +150,7 @@ def process_batch(args):
         logger.info(f"Retrying {len(all_pdf_files)} failed files from {args.retry_failed}")
     else:
         # Recursive search for PDFs
-        all_pdf_files = list(pdf_dir.rglob("*.pdf"))
-        all_pdf_files = [str(p) for p in all_pdf_files]
+        all_pdf_files = [str(p) for p in iter_pdf_files(pdf_dir)]
     
     # Apply limit if specified
     if args.limit:
@@ -194,6 +197,20 @@ def process_batch(args):
         else:
             tracker.mark_failed(file_path, error or "Unknown insert error", stage="insert")
     
+    # Extraction callback: record each case as soon as it finishes rather than
+    # after the slowest PDF in the batch
+    def on_extract_result(case):
+        """Callback for each extraction result."""
+        if case.extraction_successful:
+            tracker.mark_extraction_success(case.metadata.pdf_filename or "")
+        else:
+            tracker.mark_failed(
+                file_path=case.metadata.pdf_filename or "",
+                error=case.error_message or "Unknown extraction error",
+                stage="extraction",
+                metadata_row=None
+            )
+    
     # Determine batch size (0 means process all at once - original behavior)
     batch_size = args.batch_size if hasattr(args, 'batch_size') else 10
     
@@ -224,24 +241,12 @@ def process_batch(args):
                 metadata_csv=args.csv,
                 limit=None,
                 parallel=parallel,
-                pdf_files=batch_files
+                pdf_files=batch_files,
+                on_result=on_extract_result
             )
             
-            # Track extraction results
-            batch_successful = []
-            for case in batch_cases:
-                if case.extraction_successful:
-                    tracker.mark_extraction_success(case.metadata.pdf_filename or "")
-                    batch_successful.append(case)
-                else:
-                    total_extraction_failed += 1
-                    tracker.mark_failed(
-                        file_path=case.metadata.pdf_filename or "",
-                        error=case.error_message or "Unknown extraction error",
-                        stage="extraction",
-                        metadata_row=None
-                    )
-            
+            batch_successful = [case for case in batch_cases if case.extraction_successful]
+            total_extraction_failed += len(batch_cases) - len(batch_successful)
             total_extracted += len(batch_successful)
             logger.info(f"[Batch {batch_num + 1}] Extracted: {len(batch_successful)}/{len(batch_cases)}")
             
@@ -277,22 +282,11 @@ def process_batch(args):
             metadata_csv=args.csv,
             limit=None,
             parallel=parallel,
-            pdf_files=pdf_files
+            pdf_files=pdf_files,
+            on_result=on_extract_result
         )
         
-        # Track extraction results
-        successful = []
-        for case in cases:
-            if case.extraction_successful:
-                tracker.mark_extraction_success(case.metadata.pdf_filename or "")
-                successful.append(case)
-            else:
-                tracker.mark_failed(
-                    file_path=case.metadata.pdf_filename or "",
-                    error=case.error_message or "Unknown extraction error",
-                    stage="extraction",
-                    metadata_row=None
-                )
+        successful = [case for case in cases if case.extraction_successful]
         
         total_extracted = len(successful)
         total_extraction_failed = len(cases) - len(successful)
@@ -5,10 +5,12 @@ Splits chunks into sentences and creates sentence-level database records.
 
 import re
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
+from app.services.sentence_copy import copy_sentence_rows
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,6 +28,12 @@ class SentenceProcessor:
         r'\d+\s+S\.\s*Ct\.\s+\d+',       # Supreme Court Reporter
     ]
     
+    # All protected patterns as one alternation, so citations are stashed in a single pass
+    CITATION_RE = re.compile('|'.join(f'(?:{p})' for p in PROTECTED_PATTERNS), re.IGNORECASE)
+    PLACEHOLDER_RE = re.compile(r'__CITATION_\d+__')
+    # Periods, question marks, exclamation points followed by space and capital
+    SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+(?=[A-Z])')
+    
     def __init__(self, db_engine: Engine):
         self.db = db_engine
     
@@ -42,21 +50,18 @@ class SentenceProcessor:
         if not text or len(text.strip()) < 10:
             return []
         
-        # Protect citations from splitting
-        protected_text = text
+        # Protect citations from splitting (one linear re.sub pass, no str.replace rescans)
         protections = {}
         
-        for i, pattern in enumerate(self.PROTECTED_PATTERNS):
-            matches = list(re.finditer(pattern, protected_text, re.IGNORECASE))
-            for j, match in enumerate(matches):
-                placeholder = f"__CITATION_{i}_{j}__"
-                protections[placeholder] = match.group()
-                protected_text = protected_text.replace(match.group(), placeholder, 1)
+        def _stash(match):
+            placeholder = f"__CITATION_{len(protections)}__"
+            protections[placeholder] = match.group()
+            return placeholder
+        
+        protected_text = self.CITATION_RE.sub(_stash, text)
         
         # Split on sentence boundaries
-        # Look for periods, question marks, exclamation points followed by space and capital
-        sentence_pattern = r'(?<=[.!?])\s+(?=[A-Z])'
-        raw_sentences = re.split(sentence_pattern, protected_text)
+        raw_sentences = self.SENTENCE_SPLIT_RE.split(protected_text)
         
         sentences = []
         for i, sent in enumerate(raw_sentences):
@@ -65,8 +70,8 @@ class SentenceProcessor:
                 continue
             
             # Restore protected citations
-            for placeholder, original in protections.items():
-                sent = sent.replace(placeholder, original)
+            if protections:
+                sent = self.PLACEHOLDER_RE.sub(lambda m: protections[m.group()], sent)
             
             # Skip very short sentences (likely fragments)
             if len(sent) < 15:
@@ -110,8 +115,6 @@ class SentenceProcessor:
         if not sentences:
             return []
         
-        sentence_records = []
-        
         with self.db.connect() as conn:
             # Look up case_id from chunk if not provided
             if case_id is None:
@@ -122,52 +125,34 @@ class SentenceProcessor:
                 if row:
                     case_id = row[0]
             
-            for sentence_data in sentences:
-                global_sentence_counter += 1
-                
-                try:
-                    insert_query = text("""
-                        INSERT INTO case_sentences (
-                            case_id, chunk_id, document_id, sentence_order,
-                            global_sentence_order, text, word_count,
-                            created_at, updated_at
-                        ) VALUES (
-                            :case_id, :chunk_id, :document_id, :sentence_order,
-                            :global_sentence_order, :text, :word_count,
-                            NOW(), NOW()
-                        )
-                        RETURNING sentence_id
-                    """)
-                    
-                    result = conn.execute(insert_query, {
-                        'case_id': case_id,
-                        'chunk_id': chunk_id,
-                        'document_id': document_id,
-                        'sentence_order': sentence_data['sentence_order'],
-                        'global_sentence_order': global_sentence_counter,
-                        'text': sentence_data['text'],
-                        'word_count': sentence_data['word_count']
-                    })
-                    
-                    sentence_id = result.fetchone()[0]
-                    
-                    sentence_records.append({
-                        'id': sentence_id,
-                        'text': sentence_data['text'],
-                        'sentence_id': sentence_id,
-                        'case_id': case_id,
-                        'chunk_id': chunk_id,
-                        'document_id': document_id,
-                        'sentence_order': sentence_data['sentence_order'],
-                        'global_sentence_order': global_sentence_counter,
-                        'word_count': sentence_data['word_count']
-                    })
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to insert sentence: {e}")
-                    continue
+            # Global order comes from the sentence's index, not a counter bumped
+            # inside the insert loop
+            rows = [
+                {
+                    'case_id': case_id,
+                    'chunk_id': chunk_id,
+                    'document_id': document_id,
+                    'sentence_order': sentence_data['sentence_order'],
+                    'global_sentence_order': global_sentence_counter + i,
+                    'text': sentence_data['text'],
+                    'word_count': sentence_data['word_count']
+                }
+                for i, sentence_data in enumerate(sentences, start=1)
+            ]
+            
+            # COPY, falling back to row-by-row inserts that skip only rejected rows
+            try:
+                stored = copy_sentence_rows(conn, rows)
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.warning(f"Failed to insert sentences for chunk {chunk_id}: {e}")
+                return []
             
-            conn.commit()
+            sentence_records = [
+                {'id': sentence_id, 'sentence_id': sentence_id, **row}
+                for sentence_id, row in stored
+            ]
         
         return sentence_records
     
@@ -178,6 +163,15 @@ class SentenceProcessor:
     
     def get_case_sentences(self, case_id: int) -> List[Dict[str, Any]]:
         """Get all sentences for a case."""
+        return list(self.iter_case_sentences(case_id))
+    
+    def iter_case_sentences(self, case_id: int, yield_per: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Stream a case's sentences through a server-side cursor.
+        
+        Rows are fetched yield_per at a time, so long cases never sit in memory
+        all at once and callers can start work on the first batch immediately.
+        """
         with self.db.connect() as conn:
             query = text("""
                 SELECT sentence_id, chunk_id, text, word_count, sentence_order
@@ -185,15 +179,16 @@ class SentenceProcessor:
                 WHERE case_id = :case_id
                 ORDER BY chunk_id, sentence_order
             """)
-            result = conn.execute(query, {'case_id': case_id})
+            result = conn.execute(
+                query, {'case_id': case_id},
+                execution_options={'stream_results': True, 'yield_per': yield_per}
+            )
             
-            return [
-                {
+            for row in result:
+                yield {
                     'sentence_id': row.sentence_id,
                     'chunk_id': row.chunk_id,
                     'text': row.text,
                     'word_count': row.word_count,
                     'sentence_order': row.sentence_order
                 }
-                for row in result
-            ]
@@ -7,12 +7,26 @@ Enables word-level indexing for RAG.
 import re
 import logging
 from typing import List, Dict, Set, Optional
-from collections import Counter
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
 logger = logging.getLogger(__name__)
 
+# Tokenizer patterns compiled once at import instead of per call / per token
+_TOKEN_RE = re.compile(r"\b[\w'-]+\b")
+# Pure-ASCII text (nearly all opinions) skips the regex engine: every ASCII
+# character outside [\w'-] is translated to a space, so str.split() yields the
+# maximal [\w'-] runs; stripping edge apostrophes/hyphens from a run gives exactly
+# the \b-bounded match of the token pattern
+_ASCII_SEPARATORS = str.maketrans({
+    chr(c): ' ' for c in range(128)
+    if not (chr(c).isalnum() or chr(c) in "_'-" or chr(c).isspace())
+})
+_HAS_LETTER = re.compile(r'[a-z]').search
+# Most tokens start with a letter; checking the first character against this set
+# answers the has-letter test without entering the regex engine
+_ASCII_LOWER = frozenset('abcdefghijklmnopqrstuvwxyz')
+
 
 class WordProcessor:
     """Process text for word dictionary and occurrence tracking."""
@@ -34,11 +48,62 @@ class WordProcessor:
         'further', 'any', 'however', 'therefore', 'thus', 'hence', 'although'
     }
     
+    # Upper bound on cached word ids per instance; the cache is reset when exceeded
+    WORD_CACHE_MAX_SIZE = 200_000
+    
+    # Words are upserted in sorted order so concurrent workers take the
+    # word_dictionary row locks in the same order
+    _SQL_UPSERT_WORDS = text("""
+        INSERT INTO word_dictionary (word)
+        SELECT w FROM unnest(CAST(:words AS text[])) AS w ORDER BY w
+        ON CONFLICT (word) DO UPDATE SET word = EXCLUDED.word
+        RETURNING word_id, word
+    """)
+    
+    # df only counts (word, case) pairs recorded in word_case for the first time.
+    # word_dictionary rows are locked in word_id order (FOR UPDATE under ORDER BY)
+    # so concurrent workers sharing common words queue instead of deadlocking
+    _SQL_INCREMENT_DF = text("""
+        WITH new_members AS (
+            INSERT INTO word_case (word_id, case_id)
+            SELECT w, :case_id FROM unnest(CAST(:ids AS int[])) AS w ORDER BY w
+            ON CONFLICT DO NOTHING
+            RETURNING word_id
+        ), locked AS (
+            SELECT wd.word_id
+            FROM word_dictionary wd
+            WHERE wd.word_id IN (SELECT word_id FROM new_members)
+            ORDER BY wd.word_id
+            FOR UPDATE
+        )
+        UPDATE word_dictionary wd
+        SET df = COALESCE(wd.df, 0) + 1
+        FROM locked
+        WHERE wd.word_id = locked.word_id
+    """)
+    
+    # Word search statements built once; SQLAlchemy's compiled cache reuses them per call
+    _SQL_FIND_WORD = text("""
+        SELECT cs.case_id, cs.chunk_id, cs.sentence_id, cs.text AS sentence_text
+        FROM case_sentences cs
+        WHERE cs.tsv @@ plainto_tsquery('english', :word)
+        ORDER BY cs.case_id, cs.chunk_id, cs.sentence_order
+        LIMIT 1000
+    """)
+    _SQL_FIND_WORD_IN_CASE = text("""
+        SELECT cs.case_id, cs.chunk_id, cs.sentence_id, cs.text AS sentence_text
+        FROM case_sentences cs
+        WHERE cs.tsv @@ plainto_tsquery('english', :word)
+          AND cs.case_id = :case_id
+        ORDER BY cs.chunk_id, cs.sentence_order
+    """)
+    
     def __init__(self, db_engine: Engine, batch_size: int = 500):
         self.db = db_engine
         self.batch_size = batch_size
         self._word_cache: Dict[str, int] = {}  # word -> word_id cache
         self._pending_occurrences: List[Dict] = []  # batch buffer
+        self._word_case_available: Optional[bool] = None  # checked on first df update
     
     def tokenize_text(self, text: str, remove_stop_words: bool = False) -> List[str]:
         """
@@ -59,15 +124,21 @@ class WordProcessor:
         
         # Split on whitespace and punctuation, but preserve legal terms
         # Keep hyphens in compound words, apostrophes in contractions
-        tokens = re.findall(r"\b[\w'-]+\b", text)
+        if text.isascii():
+            tokens = [run.strip("'-") for run in text.translate(_ASCII_SEPARATORS).split()]
+        else:
+            tokens = _TOKEN_RE.findall(text)
         
         # Filter tokens
         filtered_tokens = []
         for token in tokens:
             # Keep if it's at least 2 characters and contains at least one letter
-            if len(token) >= 2 and re.search(r'[a-zA-Z]', token):
-                # Remove apostrophes at the end (possessives)
-                token = re.sub(r"'s?$", "", token)
+            # (text is already lowercased, so [a-z] is enough)
+            if len(token) >= 2 and (token[0] in _ASCII_LOWER or _HAS_LETTER(token)):
+                # Remove possessive 's (tokens always end on a word character,
+                # so a bare trailing apostrophe cannot occur)
+                if token.endswith("'s"):
+                    token = token[:-2]
                 if token:
                     if remove_stop_words and token in self.STOP_WORDS:
                         continue
@@ -80,6 +151,10 @@ class WordProcessor:
         Get or create word IDs for a list of words.
         Uses cache for performance.
         
+        Newly resolved ids are not added to the cache here: conn's transaction
+        may still roll back. Callers pass the result to _remember_word_ids once
+        their transaction has committed.
+        
         Args:
             conn: Database connection (within transaction)
             words: List of unique words
@@ -93,56 +168,33 @@ class WordProcessor:
         word_to_id = {}
         words_to_lookup = []
         
-        # Check cache first
+        # Check cache first (Zipf-frequent words are almost always hits)
+        cache_get = self._word_cache.get
         for word in words:
-            if word in self._word_cache:
-                word_to_id[word] = self._word_cache[word]
-            else:
+            word_id = cache_get(word)
+            if word_id is None:
                 words_to_lookup.append(word)
+            else:
+                word_to_id[word] = word_id
         
         if not words_to_lookup:
             return word_to_id
         
-        # Batch lookup existing words
-        unique_words = list(set(words_to_lookup))
-        
-        # Find existing words
-        if unique_words:
-            # Use ANY array syntax for batch lookup
-            query = text("""
-                SELECT word_id, word 
-                FROM word_dictionary 
-                WHERE word = ANY(:words)
-            """)
-            result = conn.execute(query, {'words': unique_words})
-            
-            for row in result:
-                word_to_id[row.word] = row.word_id
-                self._word_cache[row.word] = row.word_id
-        
-        # Create new words that don't exist
-        new_words = [w for w in unique_words if w not in word_to_id]
-        
-        if new_words:
-            insert_query = text("""
-                INSERT INTO word_dictionary (word)
-                VALUES (:word)
-                ON CONFLICT (word) DO UPDATE SET word = EXCLUDED.word
-                RETURNING word_id, word
-            """)
-            
-            for word in new_words:
-                try:
-                    result = conn.execute(insert_query, {'word': word})
-                    row = result.fetchone()
-                    if row:
-                        word_to_id[row.word] = row.word_id
-                        self._word_cache[row.word] = row.word_id
-                except Exception as e:
-                    logger.warning(f"Failed to insert word '{word}': {e}")
+        # Deduplicate: ON CONFLICT DO UPDATE cannot touch the same row twice
+        unique_words = list(dict.fromkeys(words_to_lookup))
         
+        # One upsert resolves every missing word: DO UPDATE makes RETURNING
+        # yield the row for existing words as well as newly inserted ones
+        result = conn.execute(self._SQL_UPSERT_WORDS, {'words': unique_words})
+        word_to_id.update({row.word: row.word_id for row in result})
         return word_to_id
     
+    def _remember_word_ids(self, word_to_id: Dict[str, int]) -> None:
+        """Add word ids to the cache; only call after their transaction committed."""
+        if len(self._word_cache) + len(word_to_id) > self.WORD_CACHE_MAX_SIZE:
+            self._word_cache.clear()
+        self._word_cache.update(word_to_id)
+    
     def process_sentence_words(
         self,
         conn,
@@ -155,8 +207,12 @@ class WordProcessor:
         """
         Process a sentence's text for word occurrences.
         
+        When conn has no transaction open, the word ids are resolved in a short
+        transaction of their own and cached once it commits. Inside a caller's
+        transaction they are not cached: it may still roll back.
+        
         Args:
-            conn: Database connection (within transaction)
+            conn: Database connection
             case_id: Case identifier
             chunk_id: Chunk identifier
             sentence_id: Sentence identifier
@@ -178,52 +234,55 @@ class WordProcessor:
         # Get unique words
         unique_words = list(set(tokens))
         
-        # Get or create word IDs
-        word_to_id = self.get_or_create_word_ids(conn, unique_words)
-        
-        # Create word occurrences (positions are relative to sentence)
-        word_occurrences = []
-        for position, word in enumerate(tokens):
-            if word in word_to_id:
-                word_occurrences.append({
-                    'word_id': word_to_id[word],
-                    'case_id': case_id,
-                    'chunk_id': chunk_id,
-                    'sentence_id': sentence_id,
-                    'document_id': document_id,
-                    'position': position
-                })
-        
-        # Batch insert word occurrences
-        if word_occurrences:
-            self._insert_word_occurrences(conn, word_occurrences)
+        # Get or create word IDs (no per-token occurrence rows are built: the
+        # word_occurrence table was dropped in migration 018 in favour of tsvector)
+        if conn.in_transaction():
+            self.get_or_create_word_ids(conn, unique_words)
+        else:
+            with conn.begin():
+                word_to_id = self.get_or_create_word_ids(conn, unique_words)
+            # Committed: the ids are now safe to reuse for later sentences
+            self._remember_word_ids(word_to_id)
         
         return {
             'words_processed': len(tokens),
-            'unique_words': len(unique_words),
-            'occurrences_created': len(word_occurrences)
+            'unique_words': len(unique_words)
         }
     
-    def _insert_word_occurrences(self, conn, occurrences: List[Dict]) -> None:
-        """Insert word occurrences in batch.
-        
-        NOTE: word_occurrence table was dropped in scalability migration (018).
-        We now rely on tsvector columns on case_chunks and case_sentences for full-text search.
-        This method is now a no-op but kept for API compatibility.
-        """
-        # word_occurrence table removed - using tsvector instead
-        pass
-    
-    def update_document_frequencies(self, conn, case_id: int) -> None:
+    def update_document_frequencies(self, conn, case_id: int, word_ids: Optional[List[int]] = None) -> None:
         """
         Update document frequency counts for words in a case.
         Should be called after processing all sentences for a case.
         
-        NOTE: word_occurrence table was dropped in scalability migration (018).
-        This method is now a no-op but kept for API compatibility.
+        Membership is recorded in word_case (migration 021) and only words new
+        to the case bump df, so re-processing a case leaves df unchanged.
+        Without word_ids there is nothing to count (word_occurrence was dropped
+        in migration 018), so the call is a no-op. It is also a no-op, with a
+        single warning, while migration 021 has not been applied.
+        
+        The UPDATE locks word_dictionary rows shared by every case, so conn
+        should be a short transaction of its own rather than a long per-case one.
+        
+        Args:
+            conn: Database connection (within transaction)
+            case_id: Case identifier
+            word_ids: The case's distinct word ids
         """
-        # word_occurrence table removed - using tsvector instead
-        pass
+        if word_ids and self._has_word_case(conn):
+            conn.execute(self._SQL_INCREMENT_DF, {'case_id': case_id, 'ids': sorted(word_ids)})
+    
+    def _has_word_case(self, conn) -> bool:
+        """Whether the word_case table (migration 021) exists; checked once, warns once."""
+        if self._word_case_available is None:
+            self._word_case_available = conn.execute(
+                text("SELECT to_regclass('public.word_case') IS NOT NULL")
+            ).scalar()
+            if not self._word_case_available:
+                logger.warning(
+                    "word_case table not found (apply migrations/021_word_case_membership.sql); "
+                    "skipping document frequency updates"
+                )
+        return self._word_case_available
     
     def clear_cache(self):
         """Clear the word ID cache."""
@@ -245,23 +304,9 @@ class WordProcessor:
         """
         with self.db.connect() as conn:
             if case_id:
-                query = text("""
-                    SELECT cs.case_id, cs.chunk_id, cs.sentence_id, cs.sentence_text
-                    FROM case_sentences cs
-                    WHERE cs.tsv @@ plainto_tsquery('english', :word)
-                      AND cs.case_id = :case_id
-                    ORDER BY cs.chunk_id, cs.sentence_order
-                """)
-                result = conn.execute(query, {'word': word.lower(), 'case_id': case_id})
+                result = conn.execute(self._SQL_FIND_WORD_IN_CASE, {'word': word.lower(), 'case_id': case_id})
             else:
-                query = text("""
-                    SELECT cs.case_id, cs.chunk_id, cs.sentence_id, cs.sentence_text
-                    FROM case_sentences cs
-                    WHERE cs.tsv @@ plainto_tsquery('english', :word)
-                    ORDER BY cs.case_id, cs.chunk_id, cs.sentence_order
-                    LIMIT 1000
-                """)
-                result = conn.execute(query, {'word': word.lower()})
+                result = conn.execute(self._SQL_FIND_WORD, {'word': word.lower()})
             
             return [
                 {
@@ -298,41 +343,57 @@ class WordProcessor:
         if not tokens:
             return 0
         
-        # Get unique words and create IDs
+        # Get unique words and create IDs; once the cache covers the sentence's
+        # vocabulary no connection is opened and no commit is issued
         unique_words = list(set(tokens))
+        cache = self._word_cache
         
-        with self.db.connect() as conn:
-            word_to_id = self.get_or_create_word_ids(conn, unique_words)
-            conn.commit()
-        
-        # Look up case_id and chunk_id from sentence
-        with self.db.connect() as conn:
-            result = conn.execute(text(
-                "SELECT case_id, chunk_id FROM case_sentences WHERE sentence_id = :sid"
-            ), {'sid': sentence_id})
-            row = result.fetchone()
-            if not row:
-                return 0
-            case_id, chunk_id = row[0], row[1]
-        
-        # Create word occurrences
-        for position, word in enumerate(tokens):
-            if word in word_to_id:
-                self._pending_occurrences.append({
-                    'word_id': word_to_id[word],
-                    'case_id': case_id,
-                    'chunk_id': chunk_id,
-                    'sentence_id': sentence_id,
-                    'document_id': None,
-                    'position': position
-                })
-        
-        # Flush if batch is full
-        if len(self._pending_occurrences) >= self.batch_size:
-            self.flush()
+        if not all(word in cache for word in unique_words):
+            with self.db.connect() as conn:
+                word_to_id = self.get_or_create_word_ids(conn, unique_words)
+                conn.commit()
+            self._remember_word_ids(word_to_id)
         
         return len(tokens)
     
+    def process_sentences_bulk(self, case_id: int, sentences: List[Dict]) -> int:
+        """
+        Process words for all sentences of one case at once.
+        
+        Every sentence is tokenized first, then the union of their unique words
+        is resolved with a single get_or_create_word_ids call and each word's
+        document frequency is incremented once. The dictionary upsert and the
+        df update run in two short transactions, each locking rows in sorted
+        order.
+        
+        Args:
+            case_id: Case identifier
+            sentences: Sentence records with a 'text' key (as returned by
+                       SentenceProcessor.process_chunk_sentences)
+            
+        Returns:
+            Number of words processed
+        """
+        total_words = 0
+        unique_words: Dict[str, None] = {}
+        
+        for sentence in sentences:
+            tokens = self.tokenize_text(sentence.get('text', ''), remove_stop_words=False)
+            total_words += len(tokens)
+            unique_words.update(dict.fromkeys(tokens))
+        
+        if unique_words:
+            with self.db.begin() as conn:
+                word_to_id = self.get_or_create_word_ids(conn, list(unique_words))
+            # Committed: the ids are now safe to reuse for later cases
+            self._remember_word_ids(word_to_id)
+            
+            # Separate short transaction so the df row locks are released at once
+            with self.db.begin() as conn:
+                self.update_document_frequencies(conn, case_id, list(word_to_id.values()))
+        
+        return total_words
+    
     def flush(self):
         """Flush pending word occurrences to database using bulk insert.
         
@@ -118,11 +118,16 @@ def main():
     logger.info(f"Database: {'Disabled' if args.no_db else 'Enabled'}")
     
     # Initialize components
-    pdf_extractor = PDFExtractor(config.llama_cloud_api_key, mode=args.pdf_extractor)
+    pdf_extractor = PDFExtractor(
+        config.llama_cloud_api_key,
+        mode=args.pdf_extractor,
+        cache_dir=config.get_cache_dir("pdf")
+    )
     llm_extractor = LLMExtractor(
         model=config.ollama_model,
         base_url=config.ollama_base_url,
-        timeout=config.llm_timeout
+        timeout=config.llm_timeout,
+        cache_dir=config.get_cache_dir("llm")
     )
     
     # Test Ollama connection
@@ -11,6 +11,9 @@ set -e
 DB_NAME="cases_llama3_3"
 DB_USER="postgres"
 DUMP_FILE="/docker-data/restore.dump"
+# Parallel restore workers (pg_restore loads table data with COPY; jobs run
+# table loads and index builds concurrently). Needs a custom-format dump.
+RESTORE_JOBS="${RESTORE_JOBS:-4}"
 
 echo "🔧 Auto-restore script starting..."
 
@@ -32,9 +35,10 @@ fi
 echo "📦 Database is empty. Restoring from dump..."
 echo "   Dump file: $DUMP_FILE"
 echo "   Database: $DB_NAME"
+echo "   Jobs: $RESTORE_JOBS"
 
 # Restore the dump
-pg_restore -U $DB_USER -d $DB_NAME --no-owner --no-privileges --verbose "$DUMP_FILE" || {
+pg_restore -U $DB_USER -d $DB_NAME --no-owner --no-privileges --jobs "$RESTORE_JOBS" --verbose "$DUMP_FILE" || {
     echo "⚠️  pg_restore completed with warnings (this is often normal)"
 }
 
@@ -16,7 +16,8 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from sqlalchemy import text
-from app.database import engine
+from app.database import engine, get_redis_client
+from app.services.context_navigator import clear_navigation_cache
 
 
 # Tables to clear (in order - respects foreign key constraints)
@@ -27,6 +28,7 @@ CASE_TABLES = [
     "case_chunks", 
     "case_phrases",
     "case_sentences",
+    "word_case",  # Word/case membership for df (migration 021)
     "statute_citations",
     "citation_edges",
     "issue_chunks",
@@ -67,17 +69,39 @@ PROTECTED_TABLES = [
 
 
 def get_table_counts(conn) -> dict:
-    """Get row counts for all case-related tables."""
-    counts = {}
-    for table in CASE_TABLES:
+    """Get row counts for all case-related tables (two round trips in total)."""
+    # Which tables exist: a COUNT on a missing table would abort the transaction
+    existing = set(conn.execute(
+        text("SELECT tablename FROM pg_tables WHERE schemaname = 'public' AND tablename = ANY(:tables)"),
+        {'tables': CASE_TABLES}
+    ).scalars())
+    
+    counts = {table: "ERROR: table does not exist" for table in CASE_TABLES}
+    if existing:
+        # All counts in one statement instead of one query per table
+        union = " UNION ALL ".join(
+            f"SELECT '{table}' AS table_name, COUNT(*) AS row_count FROM {table}"
+            for table in CASE_TABLES if table in existing
+        )
         try:
-            result = conn.execute(text(f"SELECT COUNT(*) FROM {table}"))
-            counts[table] = result.scalar()
+            for row in conn.execute(text(union)):
+                counts[row.table_name] = row.row_count
         except Exception as e:
-            counts[table] = f"ERROR: {e}"
+            for table in existing:
+                counts[table] = f"ERROR: {e}"
     return counts
 
 
+def clear_navigation_cache_entries():
+    """Drop the API's cached navigation results, which now point at deleted rows."""
+    try:
+        removed = clear_navigation_cache(get_redis_client())
+        if removed:
+            print(f"  [OK] {removed} navigation cache entries cleared")
+    except Exception as e:
+        print(f"  [WARN] Navigation cache not cleared (entries expire with the cache TTL): {e}")
+
+
 def clear_cases(dry_run: bool = False):
     """Clear all case-related data from the database."""
     
@@ -133,6 +157,8 @@ def clear_cases(dry_run: bool = False):
             print("[SUCCESS] All case data cleared successfully!")
             print("=" * 60)
             
+            clear_navigation_cache_entries()
+            
             # Verify
             print("\nVerifying...")
             counts = get_table_counts(conn)
@@ -0,0 +1,135 @@
+"""
+Check the SQL the services run against case_sentences/case_chunks against the
+column lists in current_schema.sql (the pg_dump of the production schema).
+
+Each service method is run on a recording engine, so the test covers the
+statements exactly as they are sent, including ones built inside methods.
+"""
+
+import importlib.util
+import re
+import sys
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Query aliases used for these tables throughout the services
+ALIASES = {'cs': 'case_sentences', 'cc': 'case_chunks'}
+
+
+def _schema_columns() -> dict:
+    """table name -> set of column names, parsed from current_schema.sql"""
+    raw = (ROOT / 'current_schema.sql').read_bytes()
+    dump = raw.decode('utf-16') if raw[:2] in (b'\xff\xfe', b'\xfe\xff') else raw.decode('utf-8')
+    columns = {}
+    for table in set(ALIASES.values()):
+        match = re.search(r'CREATE TABLE public\.%s \((.*?)\n\);' % table, dump, re.S)
+        assert match, f"{table} not found in current_schema.sql"
+        columns[table] = {line.split()[0] for line in match.group(1).strip().splitlines()}
+    return columns
+
+
+class _Result:
+    def __iter__(self):
+        return iter(())
+
+    def fetchone(self):
+        return None
+
+    def fetchall(self):
+        return []
+
+    def scalar(self):
+        return None
+
+
+class _RecordingConnection:
+    def __init__(self, statements):
+        self.statements = statements
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, statement, *args, **kwargs):
+        self.statements.append(str(statement))
+        return _Result()
+
+    def execution_options(self, **options):
+        return self
+
+    def commit(self):
+        pass
+
+
+class _RecordingEngine:
+    def __init__(self):
+        self.statements = []
+
+    def connect(self):
+        return _RecordingConnection(self.statements)
+
+    begin = connect
+
+
+def _load(name: str, path: str, package: str = None):
+    if package and package not in sys.modules:
+        pkg = types.ModuleType(package)
+        pkg.__path__ = [str(ROOT / package)]
+        sys.modules[package] = pkg
+    spec = importlib.util.spec_from_file_location(name, ROOT / path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _recorded_statements() -> list:
+    engine = _RecordingEngine()
+
+    navigator_module = _load('_nav_under_test', 'app/services/context_navigator.py')
+    navigator = navigator_module.ContextNavigator(engine)
+    navigator.find_word_in_context('appeal', case_id=1)
+    navigator.find_word_in_context('"best interest"')
+    navigator.get_word_context_window('appeal', chunk_id=1)
+    navigator.get_chunk_with_highlights_json(1, ['appeal', '"best interest"'])
+    navigator.get_adjacent_chunks(1)
+    navigator.get_adjacent_chunks_batch([1, 2])
+
+    app_words = _load('_app_words_under_test', 'app/services/word_processor.py')
+    app_processor = app_words.WordProcessor(engine)
+    app_processor.find_word_positions('appeal')
+    app_processor.find_word_positions('appeal', case_id=1)
+    app_processor.process_case_sentences_words(1)
+
+    pipeline_words = _load('pipeline.word_processor', 'pipeline/word_processor.py', package='pipeline')
+    pipeline_processor = pipeline_words.WordProcessor(engine)
+    pipeline_processor.find_word_positions('appeal')
+    pipeline_processor.find_word_positions('appeal', case_id=1)
+
+    return engine.statements
+
+
+def test_aliased_columns_exist_in_schema():
+    columns = _schema_columns()
+    statements = _recorded_statements()
+    assert any('case_sentences' in sql for sql in statements)
+
+    missing = set()
+    for sql in statements:
+        for alias, column in re.findall(r'\b(cs|cc)\.(\w+)', sql):
+            if column not in columns[ALIASES[alias]]:
+                missing.add(f"{alias}.{column}")
+    assert not missing, f"columns not in current_schema.sql: {sorted(missing)}"
+
+
+def test_unaliased_case_sentences_selects_exist_in_schema():
+    columns = _schema_columns()['case_sentences']
+    for sql in _recorded_statements():
+        match = re.search(r'SELECT\s+(.*?)\s+FROM\s+case_sentences\s+WHERE', sql, re.S)
+        if match:
+            selected = {part.strip() for part in match.group(1).split(',')}
+            assert selected <= columns, f"columns not in current_schema.sql: {sorted(selected - columns)}"